@@ -1,15 +1,25 @@
 """Built-in agent implementations."""
 
 from .base import (
+    PROMPTS_DIR,
+    AgentPool,
     BaseLayercodeAgent,
     available_agents,
     create_agent,
+    freeze_registry,
+    load_system_prompt,
+    preload_prompts,
     register_agent,
 )
 
 __all__ = [
+    "PROMPTS_DIR",
+    "AgentPool",
     "BaseLayercodeAgent",
     "available_agents",
     "create_agent",
+    "freeze_registry",
+    "load_system_prompt",
+    "preload_prompts",
     "register_agent",
 ]
@@ -3,20 +3,88 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
-from pathlib import Path
-from typing import Any
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, ClassVar
 
 from pydantic_ai import Agent as PydanticAgent
 from pydantic_ai import RunContext
 from pydantic_ai.messages import ModelMessage
-from pydantic_ai.models.openai import OpenAIChatModelSettings
-from textprompts import load_prompt
 
 from ..sdk.events import MessagePayload, SessionEndPayload, SessionStartPayload
-from ..sdk.stream import StreamHelper
-from .base import BaseLayercodeAgent, agent
-
-PROMPTS_DIR = Path(__file__).resolve().parent / "prompts"
+from ..sdk.stream import StreamHelper, TtsBatcher
+from .base import BaseLayercodeAgent, agent, load_system_prompt, model_settings_for
+
+# Read-only menu shared by every bakery session
+MENU: Mapping[str, float] = MappingProxyType(
+    {
+        "croissant": 3.50,
+        "baguette": 2.25,
+        "chocolate cake": 18.00,
+        "sourdough": 6.00,
+    }
+)
+
+
+@dataclass(slots=True)
+class BakerySessionDeps:
+    """Per-run dependencies handed to the bakery tools."""
+
+    stream: StreamHelper
+    orders: list[dict[str, Any]]
+    reservations: list[dict[str, Any]]
+
+
+async def list_menu(ctx: RunContext[BakerySessionDeps]) -> Mapping[str, float]:
+    deps = ctx.deps
+    deps.stream.data({"tool": "list_menu", "status": "called"})
+    # pydantic-core cannot serialize mappingproxy, so hand the model a plain copy
+    return dict(MENU)
+
+
+async def make_order(
+    ctx: RunContext[BakerySessionDeps],
+    item: str,
+    quantity: int,
+) -> str:
+    deps = ctx.deps
+    normalized = item.lower()
+    price = MENU.get(normalized)
+    if price is None:
+        result = f"Sorry, we do not have {item} today."
+    else:
+        total = price * quantity
+        order = {"item": normalized, "quantity": quantity, "total": total}
+        deps.orders.append(order)
+        result = f"Order confirmed: {quantity} x {normalized} for ${total:.2f}."
+    deps.stream.data(
+        {
+            "tool": "make_order",
+            "args": {"item": item, "quantity": quantity},
+            "result": result,
+        }
+    )
+    return result
+
+
+async def book_table(
+    ctx: RunContext[BakerySessionDeps],
+    name: str,
+    time: str,
+    guests: int,
+) -> str:
+    deps = ctx.deps
+    reservation = {"name": name, "time": time, "guests": guests}
+    deps.reservations.append(reservation)
+    result = f"Reservation booked for {name} at {time} for {guests} guests."
+    deps.stream.data(
+        {
+            "tool": "book_table",
+            "args": reservation,
+            "result": result,
+        }
+    )
+    return result
 
 
 @agent("bakery")
@@ -26,81 +94,34 @@ class BakeryAgent(BaseLayercodeAgent):
     name = "bakery"
     description = "Bakery assistant with ordering tools"
 
+    # PydanticAI agents are built once per model and shared across instances
+    _agents: ClassVar[dict[str, PydanticAgent[BakerySessionDeps, str]]] = {}
+
+    __slots__ = ("_orders", "_reservations", "_agent")
+
     def __init__(self, model: str) -> None:
         super().__init__(model)
 
-        self._menu: dict[str, float] = {
-            "croissant": 3.50,
-            "baguette": 2.25,
-            "chocolate cake": 18.00,
-            "sourdough": 6.00,
-        }
         self._orders: list[dict[str, Any]] = []
         self._reservations: list[dict[str, Any]] = []
-
-        prompt = load_prompt(PROMPTS_DIR / "bakery.txt", meta="strict")
-        system_prompt = str(prompt.prompt)
-
-        model_settings = None
-        # Configure model settings for OpenAI GPT-5-nano to be even faster
-        if model == "openai:gpt-5-nano":
-            model_settings = OpenAIChatModelSettings(openai_reasoning_effort="minimal")
-        self._agent = PydanticAgent(
-            model,
-            system_prompt=system_prompt,
-            deps_type=StreamHelper,
-            model_settings=model_settings,
-        )
-
-        @self._agent.tool
-        async def list_menu(ctx: RunContext[StreamHelper]) -> Mapping[str, float]:
-            stream = ctx.deps
-            stream.data({"tool": "list_menu", "status": "called"})
-            return self._menu
-
-        @self._agent.tool
-        async def make_order(
-            ctx: RunContext[StreamHelper],
-            item: str,
-            quantity: int,
-        ) -> str:
-            stream = ctx.deps
-            normalized = item.lower()
-            if normalized not in self._menu:
-                result = f"Sorry, we do not have {item} today."
-            else:
-                total = self._menu[normalized] * quantity
-                order = {"item": normalized, "quantity": quantity, "total": total}
-                self._orders.append(order)
-                result = f"Order confirmed: {quantity} x {normalized} for ${total:.2f}."
-            stream.data(
-                {
-                    "tool": "make_order",
-                    "args": {"item": item, "quantity": quantity},
-                    "result": result,
-                }
+        self._agent = self._get_agent(model)
+
+    @classmethod
+    def _get_agent(cls, model: str) -> PydanticAgent[BakerySessionDeps, str]:
+        """Return the shared PydanticAI agent for a model, building it on first use."""
+
+        pydantic_agent = cls._agents.get(model)
+        if pydantic_agent is None:
+            model_settings = model_settings_for(model)
+            pydantic_agent = PydanticAgent(
+                model,
+                system_prompt=load_system_prompt("bakery.txt"),
+                deps_type=BakerySessionDeps,
+                model_settings=model_settings,
+                tools=[list_menu, make_order, book_table],
             )
-            return result
-
-        @self._agent.tool
-        async def book_table(
-            ctx: RunContext[StreamHelper],
-            name: str,
-            time: str,
-            guests: int,
-        ) -> str:
-            stream = ctx.deps
-            reservation = {"name": name, "time": time, "guests": guests}
-            self._reservations.append(reservation)
-            result = f"Reservation booked for {name} at {time} for {guests} guests."
-            stream.data(
-                {
-                    "tool": "book_table",
-                    "args": reservation,
-                    "result": result,
-                }
-            )
-            return result
+            cls._agents[model] = pydantic_agent
+        return pydantic_agent
 
     def pydantic_agent(self) -> object | None:
         return self._agent
@@ -119,22 +140,29 @@ class BakeryAgent(BaseLayercodeAgent):
     ) -> list[ModelMessage]:
         user_text = payload.text or ""
 
-        async with self._agent.run_stream(user_text, deps=stream, message_history=history) as run:
-            streamed = False
+        deps = BakerySessionDeps(
+            stream=stream,
+            orders=self._orders,
+            reservations=self._reservations,
+        )
+
+        async with self._agent.run_stream(user_text, deps=deps, message_history=history) as run:
+            batcher = TtsBatcher(stream)
             async for chunk in run.stream_text(delta=True):
-                if chunk:
-                    streamed = True
-                    stream.tts(chunk)
+                batcher.push(chunk)
+            batcher.flush()
 
-            final_text = await run.get_output()
-            if final_text and not streamed:
-                stream.tts(final_text)
+            # The output is only needed when no deltas arrived to speak it already
+            if not batcher.streamed:
+                final_text = await run.get_output()
+                if final_text:
+                    stream.tts(final_text)
 
-            new_messages = list(run.new_messages())
+            new_messages = run.new_messages()
 
         stream.end()
         return new_messages
 
     async def handle_session_end(self, payload: SessionEndPayload) -> None:
-        self._orders.clear()
-        self._reservations.clear()
+        self._orders = []
+        self._reservations = []
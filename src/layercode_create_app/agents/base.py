@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from collections.abc import Callable
-from typing import Any, TypeVar
+from collections.abc import Callable, Mapping
+from functools import cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, ClassVar, TypeVar
 
 from pydantic_ai.messages import ModelMessage
+from pydantic_ai.settings import ModelSettings
 
 from ..sdk.events import (
     DataPayload,
@@ -17,6 +22,25 @@ from ..sdk.events import (
 )
 from ..sdk.stream import StreamHelper
 
+PROMPTS_DIR = Path(__file__).resolve().parent / "prompts"
+
+
+@cache
+def load_system_prompt(filename: str) -> str:
+    """Load and cache a system prompt from PROMPTS_DIR (read once per process)."""
+
+    from textprompts import load_prompt
+
+    prompt = load_prompt(PROMPTS_DIR / filename, meta="strict")
+    return str(prompt.prompt)
+
+
+async def preload_prompts() -> None:
+    """Warm the prompt cache off the event loop so agents never read files inline."""
+
+    filenames = sorted(path.name for path in PROMPTS_DIR.glob("*.txt"))
+    await asyncio.gather(*(asyncio.to_thread(load_system_prompt, name) for name in filenames))
+
 
 class BaseLayercodeAgent(ABC):
     """Base class for agents handling LayerCode webhook events."""
@@ -24,6 +48,12 @@ class BaseLayercodeAgent(ABC):
     name: str
     description: str
 
+    # Agents that keep no per-session state on the instance may set this to False
+    # so AgentPool can share a single instance across sessions.
+    PER_SESSION_STATE: ClassVar[bool] = True
+
+    __slots__ = ("model",)
+
     def __init__(self, model: str) -> None:
         self.model = model
 
@@ -77,42 +107,91 @@ class BaseLayercodeAgent(ABC):
         return None
 
 
+def model_settings_for(model: str) -> ModelSettings | None:
+    """Return tuned model settings for known models, or None for provider defaults.
+
+    Provider modules are imported lazily so agents running other models never pay
+    for importing an SDK they do not use.
+    """
+
+    # Configure model settings for OpenAI GPT-5-nano to be even faster
+    if model == "openai:gpt-5-nano":
+        from pydantic_ai.models.openai import OpenAIChatModelSettings
+
+        return OpenAIChatModelSettings(openai_reasoning_effort="minimal")
+    return None
+
+
 AgentFactory = Callable[[str], BaseLayercodeAgent]
 
 
-_REGISTRY: dict[str, AgentFactory] = {}
+_REGISTRY: Mapping[str, AgentFactory] = {}
+
+
+def _registry_key(name: str) -> str:
+    """Normalize an agent name, reusing it as-is when already lowercase."""
+
+    return name if name.islower() else name.lower()
 
 
 def register_agent(name: str, factory: AgentFactory) -> None:
     """Register an agent factory under a given name."""
 
-    key = name.lower()
-    _REGISTRY[key] = factory
+    if not isinstance(_REGISTRY, dict):
+        raise RuntimeError(f"Cannot register agent '{name}': the agent registry is frozen")
+    _REGISTRY[_registry_key(name)] = factory
 
 
 def create_agent(name: str, model: str) -> BaseLayercodeAgent:
     """Instantiate an agent by registry name."""
 
-    key = name.lower()
-    if key not in _REGISTRY:
+    factory = _REGISTRY.get(_registry_key(name))
+    if factory is None:
         raise ValueError(f"Unknown agent '{name}'. Available: {', '.join(sorted(_REGISTRY))}")
-    return _REGISTRY[key](model)
+    return factory(model)
 
 
-TAgent = TypeVar("TAgent", bound=BaseLayercodeAgent)
+TFactory = TypeVar("TFactory", bound=AgentFactory)
 
 
-def agent(name: str) -> Callable[[Callable[[str], TAgent]], Callable[[str], TAgent]]:
+def agent(name: str) -> Callable[[TFactory], TFactory]:
     """Decorator to register agent factories."""
 
-    def decorator(factory: Callable[[str], TAgent]) -> Callable[[str], TAgent]:
+    def decorator(factory: TFactory) -> TFactory:
         register_agent(name, factory)
         return factory
 
     return decorator
 
 
+def freeze_registry() -> None:
+    """Make the agent registry read-only once all agents have been registered."""
+
+    global _REGISTRY
+    _REGISTRY = MappingProxyType(dict(_REGISTRY))
+
+
 def available_agents() -> dict[str, AgentFactory]:
     """Return a copy of the registered agent mapping."""
 
     return dict(_REGISTRY)
+
+
+class AgentPool:
+    """Hands out agent instances, reusing stateless agents per (name, model)."""
+
+    def __init__(self) -> None:
+        self._agents: dict[tuple[str, str], BaseLayercodeAgent] = {}
+
+    def get(self, name: str, model: str) -> BaseLayercodeAgent:
+        """Return a pooled agent, or a fresh one if the agent keeps per-session state."""
+
+        key = (_registry_key(name), model)
+        pooled = self._agents.get(key)
+        if pooled is not None:
+            return pooled
+
+        instance = create_agent(name, model)
+        if not instance.PER_SESSION_STATE:
+            self._agents[key] = instance
+        return instance
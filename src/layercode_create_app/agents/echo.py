@@ -15,6 +15,11 @@ class EchoAgent(BaseLayercodeAgent):
 
     name = "echo"
     description = "Simple echo agent"
+    PER_SESSION_STATE = False
+
+    _PREFIX = "You said: "
+
+    __slots__ = ("_welcome",)
 
     def __init__(self, model: str) -> None:  # noqa: D401 - docstring inherited
         super().__init__(model)
@@ -32,8 +37,7 @@ class EchoAgent(BaseLayercodeAgent):
         stream: StreamHelper,
         history: list[ModelMessage],
     ) -> list[ModelMessage]:
-        text = payload.text or ""
-        stream.tts(f"You said: {text}")
+        stream.tts(self._PREFIX + (payload.text or ""))
         stream.end()
         return []
 
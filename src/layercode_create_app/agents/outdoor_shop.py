@@ -2,29 +2,33 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Literal
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Annotated, Any, ClassVar, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic_ai import Agent as PydanticAgent
 from pydantic_ai import RunContext
 from pydantic_ai.messages import ModelMessage
-from pydantic_ai.models.openai import OpenAIChatModelSettings
-from textprompts import load_prompt
+from pydantic_core import to_json
 
 from ..sdk.events import MessagePayload, SessionEndPayload, SessionStartPayload
 from ..sdk.stream import StreamHelper
-from .base import BaseLayercodeAgent, agent
-
-PROMPTS_DIR = Path(__file__).resolve().parent / "prompts"
-
+from .base import BaseLayercodeAgent, agent, load_system_prompt, model_settings_for
 
 # =============================================================================
 # Pydantic Models for Strong Typing
 # =============================================================================
 
 
-class ProductWeight(BaseModel):
+class _FrozenModel(BaseModel):
+    """Immutable base: catalog records and tool responses are shared across sessions."""
+
+    model_config = ConfigDict(frozen=True)
+
+
+class ProductWeight(_FrozenModel):
     """Weight specifications for a product."""
 
     packed: str = Field(description="Total packed weight")
@@ -32,7 +36,7 @@ class ProductWeight(BaseModel):
     unit: Literal["imperial", "metric"] = "imperial"
 
 
-class ProductDimensions(BaseModel):
+class ProductDimensions(_FrozenModel):
     """Dimension specifications - varies by product type."""
 
     floor_area_sqft: int | None = Field(default=None, description="Floor area in sq ft")
@@ -47,7 +51,7 @@ class ProductDimensions(BaseModel):
     fit: str | None = Field(default=None, description="Fit type")
 
 
-class ProductMaterials(BaseModel):
+class ProductMaterials(_FrozenModel):
     """Material specifications."""
 
     fly: str | None = Field(default=None, description="Tent fly material")
@@ -62,7 +66,7 @@ class ProductMaterials(BaseModel):
     membrane: str | None = Field(default=None, description="Waterproof membrane")
 
 
-class TemperatureRating(BaseModel):
+class TemperatureRating(_FrozenModel):
     """Temperature rating for sleeping bags."""
 
     comfort: int = Field(description="Comfort rating")
@@ -71,7 +75,7 @@ class TemperatureRating(BaseModel):
     unit: Literal["fahrenheit", "celsius"] = "fahrenheit"
 
 
-class ProductSpecifications(BaseModel):
+class ProductSpecifications(_FrozenModel):
     """Product specifications container."""
 
     weight: ProductWeight
@@ -86,7 +90,8 @@ class ProductSpecifications(BaseModel):
     features: list[str] = Field(default_factory=list, description="Product features")
 
 
-class RatingBreakdown(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class RatingBreakdown:
     """Detailed rating breakdown."""
 
     durability: float | None = None
@@ -105,7 +110,7 @@ class RatingBreakdown(BaseModel):
     value: float | None = None
 
 
-class ProductRatings(BaseModel):
+class ProductRatings(_FrozenModel):
     """Product ratings and reviews."""
 
     overall: float = Field(ge=0, le=5, description="Overall rating 0-5")
@@ -113,15 +118,16 @@ class ProductRatings(BaseModel):
     breakdown: RatingBreakdown
 
 
-class WarehouseStock(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class WarehouseStock:
     """Stock information per warehouse."""
 
     location: str
-    stock: int = Field(ge=0)
-    ships_in_days: int = Field(ge=1)
+    stock: Annotated[int, Field(ge=0)]
+    ships_in_days: Annotated[int, Field(ge=1)]
 
 
-class ProductAvailability(BaseModel):
+class ProductAvailability(_FrozenModel):
     """Product availability information."""
 
     in_stock: bool
@@ -130,7 +136,7 @@ class ProductAvailability(BaseModel):
     backorder_date: str | None = Field(default=None, description="ISO date if backordered")
 
 
-class ProductPricing(BaseModel):
+class ProductPricing(_FrozenModel):
     """Product pricing information."""
 
     regular_price: float = Field(gt=0)
@@ -140,7 +146,7 @@ class ProductPricing(BaseModel):
     sale_ends: str | None = Field(default=None, description="ISO datetime")
 
 
-class Product(BaseModel):
+class Product(_FrozenModel):
     """Complete product model."""
 
     id: str
@@ -156,7 +162,7 @@ class Product(BaseModel):
     related_products: list[str] = Field(default_factory=list)
 
 
-class ProductSearchResults(BaseModel):
+class ProductSearchResults(_FrozenModel):
     """Response from product search."""
 
     type: Literal["product_search_results"] = "product_search_results"
@@ -170,14 +176,14 @@ class ProductSearchResults(BaseModel):
 # --- Order Models ---
 
 
-class OrderCustomer(BaseModel):
+class OrderCustomer(_FrozenModel):
     """Masked customer information."""
 
     first_name: str
     email_masked: str
 
 
-class OrderTotals(BaseModel):
+class OrderTotals(_FrozenModel):
     """Order financial totals."""
 
     subtotal: float = Field(ge=0)
@@ -188,14 +194,14 @@ class OrderTotals(BaseModel):
     currency: Literal["USD"] = "USD"
 
 
-class OrderItemOptions(BaseModel):
+class OrderItemOptions(_FrozenModel):
     """Product options selected for order item."""
 
     color: str | None = None
     size: str | None = None
 
 
-class OrderItem(BaseModel):
+class OrderItem(_FrozenModel):
     """Individual item in an order."""
 
     product_id: str
@@ -206,7 +212,7 @@ class OrderItem(BaseModel):
     fulfillment_status: Literal["pending", "processing", "shipped", "delivered"]
 
 
-class ShippingAddress(BaseModel):
+class ShippingAddress(_FrozenModel):
     """Shipping address (partial for privacy)."""
 
     city: str
@@ -215,14 +221,14 @@ class ShippingAddress(BaseModel):
     country: str = "US"
 
 
-class DeliveryEstimate(BaseModel):
+class DeliveryEstimate(_FrozenModel):
     """Delivery date range estimate."""
 
     earliest: str = Field(description="ISO date")
     latest: str = Field(description="ISO date")
 
 
-class ShippingInfo(BaseModel):
+class ShippingInfo(_FrozenModel):
     """Shipping details for an order."""
 
     method: str
@@ -233,15 +239,16 @@ class ShippingInfo(BaseModel):
     estimated_delivery: DeliveryEstimate
 
 
-class OrderStatusEntry(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class OrderStatusEntry:
     """Single entry in order status history."""
 
     status: Literal["placed", "processing", "packed", "shipped", "in_transit", "delivered"]
-    timestamp: str = Field(description="ISO datetime")
+    timestamp: Annotated[str, Field(description="ISO datetime")]
     note: str
 
 
-class Order(BaseModel):
+class Order(_FrozenModel):
     """Complete order model."""
 
     id: str
@@ -254,7 +261,7 @@ class Order(BaseModel):
     status_history: list[OrderStatusEntry]
 
 
-class OrderFoundResponse(BaseModel):
+class OrderFoundResponse(_FrozenModel):
     """Response when order is found."""
 
     type: Literal["order_details"] = "order_details"
@@ -264,7 +271,7 @@ class OrderFoundResponse(BaseModel):
     support_note: str
 
 
-class OrderNotFoundHelp(BaseModel):
+class OrderNotFoundHelp(_FrozenModel):
     """Help info when order not found."""
 
     format_hint: str
@@ -272,7 +279,7 @@ class OrderNotFoundHelp(BaseModel):
     contact: str
 
 
-class OrderNotFoundResponse(BaseModel):
+class OrderNotFoundResponse(_FrozenModel):
     """Response when order is not found."""
 
     type: Literal["order_details"] = "order_details"
@@ -285,7 +292,7 @@ class OrderNotFoundResponse(BaseModel):
 # --- Policy Models ---
 
 
-class StandardReturnRules(BaseModel):
+class StandardReturnRules(_FrozenModel):
     """Standard return policy rules."""
 
     window_days: int = Field(gt=0)
@@ -295,7 +302,7 @@ class StandardReturnRules(BaseModel):
     return_shipping_cost: str
 
 
-class DefectWarrantyRules(BaseModel):
+class DefectWarrantyRules(_FrozenModel):
     """Defect warranty rules."""
 
     window_days: int = Field(gt=0)
@@ -305,7 +312,7 @@ class DefectWarrantyRules(BaseModel):
     return_shipping_cost: str
 
 
-class LifetimeRepairRules(BaseModel):
+class LifetimeRepairRules(_FrozenModel):
     """Lifetime repair service rules."""
 
     eligible_brands: list[str]
@@ -313,7 +320,7 @@ class LifetimeRepairRules(BaseModel):
     details: str
 
 
-class ReturnRules(BaseModel):
+class ReturnRules(_FrozenModel):
     """All return policy rules."""
 
     standard_returns: StandardReturnRules
@@ -321,7 +328,7 @@ class ReturnRules(BaseModel):
     lifetime_repair: LifetimeRepairRules
 
 
-class PolicyException(BaseModel):
+class PolicyException(_FrozenModel):
     """Exception to standard policy."""
 
     category: str
@@ -329,7 +336,8 @@ class PolicyException(BaseModel):
     reason: str
 
 
-class ReturnRequirement(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ReturnRequirement:
     """Item required for return."""
 
     item: str
@@ -337,15 +345,16 @@ class ReturnRequirement(BaseModel):
     note: str | None = None
 
 
-class ProcessStep(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ProcessStep:
     """Step in a process."""
 
-    step: int = Field(gt=0)
+    step: Annotated[int, Field(gt=0)]
     action: str
     details: str | None = None
 
 
-class ReturnPolicy(BaseModel):
+class ReturnPolicy(_FrozenModel):
     """Complete return policy."""
 
     name: str
@@ -359,17 +368,18 @@ class ReturnPolicy(BaseModel):
     contact_for_exceptions: str
 
 
-class ShippingOption(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ShippingOption:
     """Available shipping option."""
 
     method: str
-    price: float = Field(ge=0)
+    price: Annotated[float, Field(ge=0)]
     free_threshold: float | None = None
     delivery_estimate: str
     carrier: str
 
 
-class POBoxRestriction(BaseModel):
+class POBoxRestriction(_FrozenModel):
     """PO Box shipping restriction."""
 
     allowed: bool
@@ -377,7 +387,7 @@ class POBoxRestriction(BaseModel):
     note: str
 
 
-class RegionalRestriction(BaseModel):
+class RegionalRestriction(_FrozenModel):
     """Regional shipping restriction."""
 
     allowed: bool
@@ -386,7 +396,7 @@ class RegionalRestriction(BaseModel):
     note: str | None = None
 
 
-class ShippingRestrictions(BaseModel):
+class ShippingRestrictions(_FrozenModel):
     """All shipping restrictions."""
 
     po_boxes: POBoxRestriction
@@ -394,14 +404,14 @@ class ShippingRestrictions(BaseModel):
     international: RegionalRestriction
 
 
-class PeakSeasonDates(BaseModel):
+class PeakSeasonDates(_FrozenModel):
     """Peak season date range."""
 
     start: str
     end: str
 
 
-class ProcessingTime(BaseModel):
+class ProcessingTime(_FrozenModel):
     """Order processing time info."""
 
     standard: str
@@ -409,7 +419,7 @@ class ProcessingTime(BaseModel):
     peak_season_dates: PeakSeasonDates
 
 
-class TrackingInfo(BaseModel):
+class TrackingInfo(_FrozenModel):
     """Tracking notification info."""
 
     provided: bool
@@ -417,7 +427,7 @@ class TrackingInfo(BaseModel):
     updates_frequency: str
 
 
-class ShippingPolicy(BaseModel):
+class ShippingPolicy(_FrozenModel):
     """Complete shipping policy."""
 
     name: str
@@ -430,7 +440,7 @@ class ShippingPolicy(BaseModel):
     tracking: TrackingInfo
 
 
-class WarrantyTier(BaseModel):
+class WarrantyTier(_FrozenModel):
     """Warranty tier definition."""
 
     tier: str
@@ -439,14 +449,15 @@ class WarrantyTier(BaseModel):
     exclusions: list[str]
 
 
-class WarrantyClaimStep(BaseModel):
+@dataclass(frozen=True, slots=True, kw_only=True)
+class WarrantyClaimStep:
     """Step in warranty claim process."""
 
-    step: int = Field(gt=0)
+    step: Annotated[int, Field(gt=0)]
     action: str
 
 
-class WarrantyClaimProcess(BaseModel):
+class WarrantyClaimProcess(_FrozenModel):
     """Warranty claim process details."""
 
     steps: list[WarrantyClaimStep]
@@ -454,7 +465,7 @@ class WarrantyClaimProcess(BaseModel):
     resolution_time: str
 
 
-class WarrantyPolicy(BaseModel):
+class WarrantyPolicy(_FrozenModel):
     """Complete warranty policy."""
 
     name: str
@@ -466,7 +477,7 @@ class WarrantyPolicy(BaseModel):
     important_notes: list[str]
 
 
-class PolicyFoundResponse(BaseModel):
+class PolicyFoundResponse(_FrozenModel):
     """Response when policy is found."""
 
     type: Literal["policy_details"] = "policy_details"
@@ -475,7 +486,7 @@ class PolicyFoundResponse(BaseModel):
     related_policies: list[str]
 
 
-class PolicyNotFoundResponse(BaseModel):
+class PolicyNotFoundResponse(_FrozenModel):
     """Response when policy is not found."""
 
     type: Literal["policy_details"] = "policy_details"
@@ -489,30 +500,43 @@ class PolicyNotFoundResponse(BaseModel):
 # Mock Data (typed with models)
 # =============================================================================
 
+
+def _C[M: BaseModel](cls: type[M], **fields: Any) -> M:
+    """Build a trusted catalog record without running validation."""
+    return cls.model_construct(**fields)
+
+
 PRODUCT_CATALOG: dict[str, Product] = {
-    "TENT-UL-2P": Product(
+    "TENT-UL-2P": _C(
+        Product,
         id="TENT-UL-2P",
         name="Nimbus CloudLite 2P",
         brand="Nimbus Gear",
         category="tents",
         description="Ultralight 2-person backpacking tent with weather protection.",
-        pricing=ProductPricing(
+        pricing=_C(
+            ProductPricing,
             regular_price=449.99,
             sale_price=379.99,
             discount_percentage=16,
             sale_ends="2025-12-15T00:00:00Z",
         ),
-        specifications=ProductSpecifications(
-            weight=ProductWeight(packed="2 lbs 4 oz", minimum="1 lb 14 oz"),
-            dimensions=ProductDimensions(
-                floor_area_sqft=28, peak_height_inches=42, packed_size="5x18 inches"
+        specifications=_C(
+            ProductSpecifications,
+            weight=_C(ProductWeight, packed="2 lbs 4 oz", minimum="1 lb 14 oz"),
+            dimensions=_C(
+                ProductDimensions,
+                floor_area_sqft=28,
+                peak_height_inches=42,
+                packed_size="5x18 inches",
             ),
-            materials=ProductMaterials(fly="15D Silnylon", floor="20D Nylon", poles="DAC NSL"),
+            materials=_C(ProductMaterials, fly="15D Silnylon", floor="20D Nylon", poles="DAC NSL"),
             capacity=2,
             season_rating="3-season",
             waterproof_rating_mm=3000,
         ),
-        ratings=ProductRatings(
+        ratings=_C(
+            ProductRatings,
             overall=4.7,
             review_count=234,
             breakdown=RatingBreakdown(
@@ -523,7 +547,8 @@ PRODUCT_CATALOG: dict[str, Product] = {
                 livability=4.3,
             ),
         ),
-        availability=ProductAvailability(
+        availability=_C(
+            ProductAvailability,
             in_stock=True,
             quantity=23,
             warehouses=[
@@ -534,26 +559,32 @@ PRODUCT_CATALOG: dict[str, Product] = {
         certifications=["bluesign approved", "Climate Neutral Certified"],
         related_products=["FOOTPRINT-CL2P", "GUYLINE-REFL-4PK", "STAKES-UL-6PK"],
     ),
-    "TENT-4S-2P": Product(
+    "TENT-4S-2P": _C(
+        Product,
         id="TENT-4S-2P",
         name="Nimbus StormShield 2P",
         brand="Nimbus Gear",
         category="tents",
         description="4-season tent for alpine conditions and winter camping.",
-        pricing=ProductPricing(regular_price=699.99),
-        specifications=ProductSpecifications(
-            weight=ProductWeight(packed="5 lbs 8 oz", minimum="4 lbs 12 oz"),
-            dimensions=ProductDimensions(
-                floor_area_sqft=32, peak_height_inches=44, packed_size="7x22 inches"
+        pricing=_C(ProductPricing, regular_price=699.99),
+        specifications=_C(
+            ProductSpecifications,
+            weight=_C(ProductWeight, packed="5 lbs 8 oz", minimum="4 lbs 12 oz"),
+            dimensions=_C(
+                ProductDimensions,
+                floor_area_sqft=32,
+                peak_height_inches=44,
+                packed_size="7x22 inches",
             ),
-            materials=ProductMaterials(
-                fly="40D Ripstop Nylon", floor="70D Nylon", poles="Easton Syclone"
+            materials=_C(
+                ProductMaterials, fly="40D Ripstop Nylon", floor="70D Nylon", poles="Easton Syclone"
             ),
             capacity=2,
             season_rating="4-season",
             waterproof_rating_mm=5000,
         ),
-        ratings=ProductRatings(
+        ratings=_C(
+            ProductRatings,
             overall=4.9,
             review_count=87,
             breakdown=RatingBreakdown(
@@ -564,7 +595,8 @@ PRODUCT_CATALOG: dict[str, Product] = {
                 livability=4.6,
             ),
         ),
-        availability=ProductAvailability(
+        availability=_C(
+            ProductAvailability,
             in_stock=True,
             quantity=12,
             warehouses=[
@@ -575,37 +607,52 @@ PRODUCT_CATALOG: dict[str, Product] = {
         certifications=["bluesign approved"],
         related_products=["FOOTPRINT-SS2P", "SNOW-STAKES-4PK"],
     ),
-    "PACK-UL-45": Product(
+    "PACK-UL-45": _C(
+        Product,
         id="PACK-UL-45",
         name="Nimbus TrailSwift 45L",
         brand="Nimbus Gear",
         category="backpacks",
         description="Ultralight 45L pack for multi-day fastpacking.",
-        pricing=ProductPricing(
+        pricing=_C(
+            ProductPricing,
             regular_price=289.99,
             sale_price=259.99,
             discount_percentage=10,
             sale_ends="2025-12-20T00:00:00Z",
         ),
-        specifications=ProductSpecifications(
-            weight=ProductWeight(packed="1 lb 12 oz"),
-            dimensions=ProductDimensions(
-                volume_liters=45, torso_fit_range="15-21 inches", hip_belt_range="28-42 inches"
+        specifications=_C(
+            ProductSpecifications,
+            weight=_C(ProductWeight, packed="1 lb 12 oz"),
+            dimensions=_C(
+                ProductDimensions,
+                volume_liters=45,
+                torso_fit_range="15-21 inches",
+                hip_belt_range="28-42 inches",
             ),
-            materials=ProductMaterials(
-                body="100D Robic Nylon", frame="HDPE framesheet", suspension="Mesh back panel"
+            materials=_C(
+                ProductMaterials,
+                body="100D Robic Nylon",
+                frame="HDPE framesheet",
+                suspension="Mesh back panel",
             ),
             max_load_lbs=30,
             features=["Roll-top closure", "Side water bottle pockets", "Hip belt pockets"],
         ),
-        ratings=ProductRatings(
+        ratings=_C(
+            ProductRatings,
             overall=4.6,
             review_count=156,
             breakdown=RatingBreakdown(
-                comfort=4.5, weight_value=4.9, durability=4.3, organization=4.4, load_carry=4.6
+                comfort=4.5,
+                weight_value=4.9,
+                durability=4.3,
+                organization=4.4,
+                load_carry=4.6,
             ),
         ),
-        availability=ProductAvailability(
+        availability=_C(
+            ProductAvailability,
             in_stock=True,
             quantity=45,
             warehouses=[
@@ -617,55 +664,76 @@ PRODUCT_CATALOG: dict[str, Product] = {
         certifications=["Climate Neutral Certified"],
         related_products=["RAIN-COVER-45", "PACK-CUBE-SET"],
     ),
-    "SLEEP-DOWN-20": Product(
+    "SLEEP-DOWN-20": _C(
+        Product,
         id="SLEEP-DOWN-20",
         name="Nimbus DreamLoft 20F",
         brand="Nimbus Gear",
         category="sleeping_bags",
         description="800-fill down sleeping bag rated to 20F.",
-        pricing=ProductPricing(regular_price=399.99),
-        specifications=ProductSpecifications(
-            weight=ProductWeight(packed="2 lbs 2 oz"),
-            dimensions=ProductDimensions(
-                fits_to_height="6 ft 0 in", shoulder_girth_inches=62, packed_size="8x15 inches"
+        pricing=_C(ProductPricing, regular_price=399.99),
+        specifications=_C(
+            ProductSpecifications,
+            weight=_C(ProductWeight, packed="2 lbs 2 oz"),
+            dimensions=_C(
+                ProductDimensions,
+                fits_to_height="6 ft 0 in",
+                shoulder_girth_inches=62,
+                packed_size="8x15 inches",
             ),
-            materials=ProductMaterials(
-                shell="15D Ripstop Nylon", lining="20D Taffeta", insulation="800-fill RDS Down"
+            materials=_C(
+                ProductMaterials,
+                shell="15D Ripstop Nylon",
+                lining="20D Taffeta",
+                insulation="800-fill RDS Down",
             ),
-            temperature_rating=TemperatureRating(comfort=28, lower_limit=20, extreme=-2),
+            temperature_rating=_C(TemperatureRating, comfort=28, lower_limit=20, extreme=-2),
             features=["Draft collar", "Zipper draft tube", "Stash pocket"],
         ),
-        ratings=ProductRatings(
+        ratings=_C(
+            ProductRatings,
             overall=4.8,
             review_count=312,
             breakdown=RatingBreakdown(
-                warmth=4.9, weight_value=4.7, packability=4.8, comfort=4.6, durability=4.7
+                warmth=4.9,
+                weight_value=4.7,
+                packability=4.8,
+                comfort=4.6,
+                durability=4.7,
             ),
         ),
-        availability=ProductAvailability(
-            in_stock=False, quantity=0, warehouses=[], backorder_date="2025-12-10"
+        availability=_C(
+            ProductAvailability,
+            in_stock=False,
+            quantity=0,
+            warehouses=[],
+            backorder_date="2025-12-10",
         ),
         certifications=["RDS Certified", "bluesign approved"],
         related_products=["SLEEP-LINER-SILK", "STUFF-SACK-COMP"],
     ),
-    "JACKET-RAIN-M": Product(
+    "JACKET-RAIN-M": _C(
+        Product,
         id="JACKET-RAIN-M",
         name="Nimbus StormGuard Jacket",
         brand="Nimbus Gear",
         category="apparel",
         description="Lightweight waterproof-breathable shell.",
-        pricing=ProductPricing(
+        pricing=_C(
+            ProductPricing,
             regular_price=249.99,
             sale_price=199.99,
             discount_percentage=20,
             sale_ends="2025-12-08T00:00:00Z",
         ),
-        specifications=ProductSpecifications(
-            weight=ProductWeight(packed="10.5 oz"),
-            dimensions=ProductDimensions(
-                sizes_available=["XS", "S", "M", "L", "XL", "XXL"], fit="Regular"
+        specifications=_C(
+            ProductSpecifications,
+            weight=_C(ProductWeight, packed="10.5 oz"),
+            dimensions=_C(
+                ProductDimensions, sizes_available=["XS", "S", "M", "L", "XL", "XXL"], fit="Regular"
             ),
-            materials=ProductMaterials(
+            materials=_C(
+                ProductMaterials,
                 shell="3L Waterproof-Breathable Nylon",
                 membrane="NimbusShield Pro",
                 lining="Tricot backer",
@@ -674,14 +742,20 @@ PRODUCT_CATALOG: dict[str, Product] = {
             breathability_gm2=25000,
             features=["Fully taped seams", "Helmet-compatible hood", "Pit zips", "Napoleon pocket"],
         ),
-        ratings=ProductRatings(
+        ratings=_C(
+            ProductRatings,
             overall=4.5,
             review_count=423,
             breakdown=RatingBreakdown(
-                waterproofing=4.8, breathability=4.4, fit=4.5, durability=4.3, value=4.6
+                waterproofing=4.8,
+                breathability=4.4,
+                fit=4.5,
+                durability=4.3,
+                value=4.6,
             ),
         ),
-        availability=ProductAvailability(
+        availability=_C(
+            ProductAvailability,
             in_stock=True,
             quantity=89,
             warehouses=[
@@ -696,131 +770,162 @@ PRODUCT_CATALOG: dict[str, Product] = {
 }
 
 ORDERS_DB: dict[str, Order] = {
-    "NG-2025-78234": Order(
+    "NG-2025-78234": _C(
+        Order,
         id="NG-2025-78234",
         placed_at="2025-11-28T14:32:00Z",
         status="in_transit",
-        customer=OrderCustomer(first_name="Alex", email_masked="a***n@email.com"),
-        totals=OrderTotals(subtotal=459.98, shipping=0.00, tax=36.80, discount=0.00, total=496.78),
+        customer=_C(OrderCustomer, first_name="Alex", email_masked="a***n@email.com"),
+        totals=_C(
+            OrderTotals, subtotal=459.98, shipping=0.00, tax=36.80, discount=0.00, total=496.78
+        ),
         items=[
-            OrderItem(
+            _C(
+                OrderItem,
                 product_id="TENT-UL-2P",
                 name="Nimbus CloudLite 2P",
                 quantity=1,
                 unit_price=379.99,
-                options=OrderItemOptions(color="Forest Green"),
+                options=_C(OrderItemOptions, color="Forest Green"),
                 fulfillment_status="shipped",
             ),
-            OrderItem(
+            _C(
+                OrderItem,
                 product_id="FOOTPRINT-CL2P",
                 name="CloudLite 2P Footprint",
                 quantity=1,
                 unit_price=79.99,
-                options=OrderItemOptions(),
+                options=_C(OrderItemOptions),
                 fulfillment_status="shipped",
             ),
         ],
-        shipping=ShippingInfo(
+        shipping=_C(
+            ShippingInfo,
             method="Ground",
             carrier="UPS",
             tracking_number="1Z999AA10123456784",
             tracking_url="https://ups.com/track?num=1Z999AA10123456784",
-            address=ShippingAddress(city="Boulder", state="CO", zip="80301"),
-            estimated_delivery=DeliveryEstimate(earliest="2025-12-03", latest="2025-12-05"),
+            address=_C(ShippingAddress, city="Boulder", state="CO", zip="80301"),
+            estimated_delivery=_C(DeliveryEstimate, earliest="2025-12-03", latest="2025-12-05"),
         ),
         status_history=[
             OrderStatusEntry(
-                status="placed", timestamp="2025-11-28T14:32:00Z", note="Order confirmed"
+                status="placed",
+                timestamp="2025-11-28T14:32:00Z",
+                note="Order confirmed",
             ),
             OrderStatusEntry(
-                status="processing", timestamp="2025-11-28T16:45:00Z", note="Payment verified"
+                status="processing",
+                timestamp="2025-11-28T16:45:00Z",
+                note="Payment verified",
             ),
             OrderStatusEntry(
-                status="packed", timestamp="2025-11-29T09:12:00Z", note="Packed at Denver"
+                status="packed",
+                timestamp="2025-11-29T09:12:00Z",
+                note="Packed at Denver",
             ),
             OrderStatusEntry(
-                status="shipped", timestamp="2025-11-29T14:30:00Z", note="Handed to UPS"
+                status="shipped",
+                timestamp="2025-11-29T14:30:00Z",
+                note="Handed to UPS",
             ),
             OrderStatusEntry(
-                status="in_transit", timestamp="2025-11-30T08:00:00Z", note="In transit - Denver"
+                status="in_transit",
+                timestamp="2025-11-30T08:00:00Z",
+                note="In transit - Denver",
             ),
         ],
     ),
-    "NG-2025-81456": Order(
+    "NG-2025-81456": _C(
+        Order,
         id="NG-2025-81456",
         placed_at="2025-12-01T09:15:00Z",
         status="processing",
-        customer=OrderCustomer(first_name="Jordan", email_masked="j***n@email.com"),
-        totals=OrderTotals(
-            subtotal=259.99, shipping=12.99, tax=21.84, discount=-30.00, total=264.82
+        customer=_C(OrderCustomer, first_name="Jordan", email_masked="j***n@email.com"),
+        totals=_C(
+            OrderTotals, subtotal=259.99, shipping=12.99, tax=21.84, discount=-30.00, total=264.82
         ),
         items=[
-            OrderItem(
+            _C(
+                OrderItem,
                 product_id="PACK-UL-45",
                 name="Nimbus TrailSwift 45L",
                 quantity=1,
                 unit_price=259.99,
-                options=OrderItemOptions(color="Midnight Blue", size="M/L"),
+                options=_C(OrderItemOptions, color="Midnight Blue", size="M/L"),
                 fulfillment_status="pending",
             ),
         ],
-        shipping=ShippingInfo(
+        shipping=_C(
+            ShippingInfo,
             method="Standard",
             carrier="USPS",
             tracking_number=None,
             tracking_url=None,
-            address=ShippingAddress(city="Portland", state="OR", zip="97201"),
-            estimated_delivery=DeliveryEstimate(earliest="2025-12-06", latest="2025-12-10"),
+            address=_C(ShippingAddress, city="Portland", state="OR", zip="97201"),
+            estimated_delivery=_C(DeliveryEstimate, earliest="2025-12-06", latest="2025-12-10"),
         ),
         status_history=[
             OrderStatusEntry(
-                status="placed", timestamp="2025-12-01T09:15:00Z", note="Order confirmed"
+                status="placed",
+                timestamp="2025-12-01T09:15:00Z",
+                note="Order confirmed",
             ),
             OrderStatusEntry(
-                status="processing", timestamp="2025-12-01T10:30:00Z", note="Payment verified"
+                status="processing",
+                timestamp="2025-12-01T10:30:00Z",
+                note="Payment verified",
             ),
         ],
     ),
 }
 
 POLICIES: dict[str, ReturnPolicy | ShippingPolicy | WarrantyPolicy] = {
-    "returns": ReturnPolicy(
+    "returns": _C(
+        ReturnPolicy,
         name="Return & Exchange Policy",
         last_updated="2025-09-01",
         summary="60-day guarantee on unused gear; 1-year warranty on defects.",
-        rules=ReturnRules(
-            standard_returns=StandardReturnRules(
+        rules=_C(
+            ReturnRules,
+            standard_returns=_C(
+                StandardReturnRules,
                 window_days=60,
                 condition_required="unused_with_tags",
                 refund_method="original_payment",
                 processing_time="5-7 business days",
                 return_shipping_cost="customer_responsibility",
             ),
-            defect_warranty=DefectWarrantyRules(
+            defect_warranty=_C(
+                DefectWarrantyRules,
                 window_days=365,
                 condition_required="manufacturing_defect",
                 refund_method="replacement_or_refund",
                 processing_time="7-10 business days",
                 return_shipping_cost="prepaid_label_provided",
             ),
-            lifetime_repair=LifetimeRepairRules(
+            lifetime_repair=_C(
+                LifetimeRepairRules,
                 eligible_brands=["Nimbus Gear"],
                 service_type="repair_at_cost",
                 details="We repair our own gear for life at material cost only",
             ),
         ),
         exceptions=[
-            PolicyException(
+            _C(
+                PolicyException,
                 category="Final Sale Items",
                 rule="no_returns",
                 reason="Clearance items marked 'Final Sale'",
             ),
-            PolicyException(
+            _C(
+                PolicyException,
                 category="Hygiene Items",
                 rule="unopened_only",
                 reason="Filters, bladders, base layers must be sealed",
             ),
-            PolicyException(
+            _C(
+                PolicyException,
                 category="Custom Orders",
                 rule="no_returns",
                 reason="Personalized items cannot be returned",
@@ -841,7 +946,8 @@ POLICIES: dict[str, ReturnPolicy | ShippingPolicy | WarrantyPolicy] = {
         ],
         contact_for_exceptions="returns@nimbusgear.com",
     ),
-    "shipping": ShippingPolicy(
+    "shipping": _C(
+        ShippingPolicy,
         name="Shipping Policy",
         last_updated="2025-10-15",
         summary="Free shipping over $99. Multiple speed options.",
@@ -866,30 +972,38 @@ POLICIES: dict[str, ReturnPolicy | ShippingPolicy | WarrantyPolicy] = {
                 carrier="UPS Next Day Air",
             ),
         ],
-        restrictions=ShippingRestrictions(
-            po_boxes=POBoxRestriction(
-                allowed=True, methods=["Standard Ground"], note="USPS only for PO Boxes"
+        restrictions=_C(
+            ShippingRestrictions,
+            po_boxes=_C(
+                POBoxRestriction,
+                allowed=True,
+                methods=["Standard Ground"],
+                note="USPS only for PO Boxes",
             ),
-            alaska_hawaii=RegionalRestriction(allowed=True, surcharge=15.00, additional_days=3),
-            international=RegionalRestriction(allowed=False, note="US addresses only"),
+            alaska_hawaii=_C(RegionalRestriction, allowed=True, surcharge=15.00, additional_days=3),
+            international=_C(RegionalRestriction, allowed=False, note="US addresses only"),
         ),
-        processing_time=ProcessingTime(
+        processing_time=_C(
+            ProcessingTime,
             standard="1-2 business days",
             peak_season="2-3 business days",
-            peak_season_dates=PeakSeasonDates(start="2025-11-15", end="2025-12-31"),
+            peak_season_dates=_C(PeakSeasonDates, start="2025-11-15", end="2025-12-31"),
         ),
-        tracking=TrackingInfo(
+        tracking=_C(
+            TrackingInfo,
             provided=True,
             notification_methods=["email", "sms_opt_in"],
             updates_frequency="Each scan",
         ),
     ),
-    "warranty": WarrantyPolicy(
+    "warranty": _C(
+        WarrantyPolicy,
         name="Product Warranty",
         last_updated="2025-06-01",
         summary="Nimbus Gear products backed by quality promise.",
         warranty_tiers=[
-            WarrantyTier(
+            _C(
+                WarrantyTier,
                 tier="Nimbus Gear Products",
                 duration="Lifetime limited warranty",
                 coverage="Manufacturing defects in materials and workmanship",
@@ -900,14 +1014,16 @@ POLICIES: dict[str, ReturnPolicy | ShippingPolicy | WarrantyPolicy] = {
                     "Cosmetic damage",
                 ],
             ),
-            WarrantyTier(
+            _C(
+                WarrantyTier,
                 tier="Partner Brand Products",
                 duration="Varies by manufacturer",
                 coverage="Per manufacturer terms",
                 exclusions=["See product warranty card"],
             ),
         ],
-        claim_process=WarrantyClaimProcess(
+        claim_process=_C(
+            WarrantyClaimProcess,
             steps=[
                 WarrantyClaimStep(step=1, action="Document defect with photos"),
                 WarrantyClaimStep(step=2, action="Contact warranty@nimbusgear.com"),
@@ -926,6 +1042,272 @@ POLICIES: dict[str, ReturnPolicy | ShippingPolicy | WarrantyPolicy] = {
     ),
 }
 
+# Column views over PRODUCT_CATALOG so searches scan flat tuples, not nested models
+_PRODUCT_IDS: tuple[str, ...] = tuple(PRODUCT_CATALOG)
+_PRODUCT_CATEGORIES: tuple[str, ...] = tuple(p.category for p in PRODUCT_CATALOG.values())
+_PRODUCT_SEASON_RATINGS: tuple[str | None, ...] = tuple(
+    p.specifications.season_rating for p in PRODUCT_CATALOG.values()
+)
+_PRODUCT_CAPACITIES: tuple[int | None, ...] = tuple(
+    p.specifications.capacity for p in PRODUCT_CATALOG.values()
+)
+_PRODUCT_SEARCH_TEXT: tuple[str, ...] = tuple(
+    f"{p.name} {p.description} {p.category}".lower() for p in PRODUCT_CATALOG.values()
+)
+
+# Category -> catalog positions, so category filters are a single lookup
+_CATEGORY_INDEX: dict[str, tuple[int, ...]] = {}
+for _index, _category in enumerate(_PRODUCT_CATEGORIES):
+    _CATEGORY_INDEX[_category] = (*_CATEGORY_INDEX.get(_category, ()), _index)
+
+# Trigram -> bitmask of catalog positions. Every trigram of a query must occur in a
+# matching product's search text, so ANDing the masks narrows substring checks safely.
+_ALL_PRODUCTS_MASK = (1 << len(_PRODUCT_IDS)) - 1
+_TRIGRAM_INDEX: dict[str, int] = {}
+for _index, _text in enumerate(_PRODUCT_SEARCH_TEXT):
+    for _trigram in {_text[i : i + 3] for i in range(len(_text) - 2)}:
+        _TRIGRAM_INDEX[_trigram] = _TRIGRAM_INDEX.get(_trigram, 0) | (1 << _index)
+del _index, _category, _text, _trigram
+
+
+def _substring_candidates(query: str) -> int:
+    """Return a bitmask of catalog positions whose search text may contain ``query``."""
+    mask = _ALL_PRODUCTS_MASK
+    for i in range(len(query) - 2):
+        mask &= _TRIGRAM_INDEX.get(query[i : i + 3], 0)
+        if not mask:
+            break
+    return mask
+
+
+class _ProductJson(dict[str, bytes]):
+    """Encoded product JSON, built on first access and reused afterwards."""
+
+    def __missing__(self, product_id: str) -> bytes:
+        encoded = self[product_id] = to_json(PRODUCT_CATALOG[product_id])
+        return encoded
+
+
+# Catalog records never change, so each is encoded once; cold SKUs are never encoded
+_PRODUCT_JSON = _ProductJson()
+
+
+# Actions offered per order status; anything else only gets contact_support
+_ACTIONS_BY_STATUS: dict[str, tuple[str, ...]] = {
+    "shipped": ("track_package", "contact_support"),
+    "in_transit": ("track_package", "contact_support"),
+    "processing": ("request_cancellation", "contact_support"),
+    "delivered": ("initiate_return", "contact_support"),
+}
+_DEFAULT_ACTIONS: tuple[str, ...] = ("contact_support",)
+
+
+def _get_available_actions(order: Order) -> tuple[str, ...]:
+    """Determine available actions based on order status."""
+    return _ACTIONS_BY_STATUS.get(order.status, _DEFAULT_ACTIONS)
+
+
+# Responses for known orders and policies are static, so build them once per key
+_ORDER_FOUND_RESPONSES: dict[str, OrderFoundResponse] = {
+    key: OrderFoundResponse(
+        order=order,
+        actions_available=list(_get_available_actions(order)),
+        support_note="For modifications, contact support@nimbusgear.com",
+    )
+    for key, order in ORDERS_DB.items()
+}
+# Hits echo the key back, so each found event's whole content is static JSON
+_ORDER_FOUND_EVENTS: dict[str, bytes] = {
+    key: to_json(
+        {
+            "tool": "lookup_order",
+            "event_type": "order_tracking",
+            "order_number": key,
+            "found": True,
+            "payload": response,
+        }
+    )
+    for key, response in _ORDER_FOUND_RESPONSES.items()
+}
+_ORDER_NOT_FOUND_HELP = OrderNotFoundHelp(
+    format_hint="Order numbers start with 'NG-' followed by year and number",
+    example="NG-2024-12345",
+    contact="support@nimbusgear.com",
+)
+_POLICY_FOUND_RESPONSES: dict[str, PolicyFoundResponse] = {
+    key: PolicyFoundResponse(
+        policy=policy,
+        related_policies=[p for p in POLICIES if p != key],
+    )
+    for key, policy in POLICIES.items()
+}
+_POLICY_FOUND_EVENTS: dict[str, bytes] = {
+    key: to_json(
+        {
+            "tool": "get_policy",
+            "event_type": "policy_info",
+            "policy_type": key,
+            "found": True,
+            "payload": response,
+        }
+    )
+    for key, response in _POLICY_FOUND_RESPONSES.items()
+}
+
+
+def _json_object(fields: Iterable[tuple[str, bytes]]) -> bytes:
+    """Join already-encoded values into a JSON object, preserving field order."""
+    return b"{" + b",".join(to_json(name) + b":" + value for name, value in fields) + b"}"
+
+
+def _payload_json(result: BaseModel, **encoded: bytes) -> bytes:
+    """Encode a tool response, splicing in pre-encoded JSON for the named fields."""
+    return _json_object(
+        (name, encoded[name] if name in encoded else to_json(getattr(result, name)))
+        for name in type(result).model_fields
+    )
+
+
+# =============================================================================
+# Tools
+# =============================================================================
+
+
+async def search_products(
+    ctx: RunContext[StreamHelper],
+    query: str,
+    category: str | None = None,
+    max_results: int = 3,
+) -> ProductSearchResults:
+    """Search the product catalog by keyword and optional category.
+
+    Note: This is a simplified demo. If no exact matches are found, returns
+    a sample of products from the catalog to ensure non-empty results for
+    testing purposes.
+
+    Args:
+        query: Search terms (e.g., 'ultralight tent', 'rain jacket')
+        category: Optional filter: tents, backpacks, sleeping_bags, apparel
+        max_results: Maximum products to return (default 3)
+    """
+    stream = ctx.deps
+    query_lower = query.lower()
+    # Always return at least one product, even for a non-positive max_results
+    limit = max(max_results, 1)
+
+    # Narrow via the indexes first and only look up the products being returned
+    if not category:
+        candidates: Sequence[int] = range(len(_PRODUCT_IDS))
+    else:
+        # Categories usually arrive already lowercase, so try the exact key first
+        candidates = _CATEGORY_INDEX.get(category) or _CATEGORY_INDEX.get(category.lower(), ())
+    possible = _substring_candidates(query_lower)
+    hits = [
+        index
+        for index in candidates
+        if possible >> index & 1 and query_lower in _PRODUCT_SEARCH_TEXT[index]
+    ]
+
+    # Fallback: return sample products when no matches found (demo simplification)
+    if not hits:
+        hits = candidates
+
+    returned = hits[:limit]
+    matches = [PRODUCT_CATALOG[_PRODUCT_IDS[index]] for index in returned]
+
+    result = ProductSearchResults(
+        query=query,
+        category_filter=category,
+        results_count=len(matches),
+        products=matches,
+        suggested_filters=list(_get_suggested_filters(frozenset(returned))),
+    )
+
+    products_json = b"[" + b",".join(_PRODUCT_JSON[p.id] for p in matches) + b"]"
+    stream.data_json(
+        _json_object(
+            (
+                ("tool", b'"search_products"'),
+                ("event_type", b'"product_catalog"'),
+                ("query", to_json(query)),
+                ("results_count", to_json(len(matches))),
+                ("payload", _payload_json(result, products=products_json)),
+            )
+        )
+    )
+
+    return result
+
+
+async def lookup_order(
+    ctx: RunContext[StreamHelper],
+    order_number: str,
+) -> OrderFoundResponse | OrderNotFoundResponse:
+    """Look up order status and tracking information.
+
+    Args:
+        order_number: The order ID (e.g., 'NG-2025-78234')
+    """
+    stream = ctx.deps
+    order_upper = order_number.upper().strip()
+
+    found = _ORDER_FOUND_RESPONSES.get(order_upper)
+    if found is not None:
+        stream.data_json(_ORDER_FOUND_EVENTS[order_upper])
+        return found
+
+    result = OrderNotFoundResponse(
+        order_number_searched=order_upper,
+        message="Order not found. Please verify the order number.",
+        help=_ORDER_NOT_FOUND_HELP,
+    )
+    stream.data(
+        {
+            "tool": "lookup_order",
+            "event_type": "order_tracking",
+            "order_number": order_upper,
+            "found": result.found,
+            "payload": result,
+        }
+    )
+
+    return result
+
+
+async def get_policy(
+    ctx: RunContext[StreamHelper],
+    policy_type: str,
+) -> PolicyFoundResponse | PolicyNotFoundResponse:
+    """Retrieve store policy information.
+
+    Args:
+        policy_type: Type of policy: 'returns', 'shipping', or 'warranty'
+    """
+    stream = ctx.deps
+    policy_key = policy_type.lower().strip()
+
+    found = _POLICY_FOUND_RESPONSES.get(policy_key)
+    if found is not None:
+        stream.data_json(_POLICY_FOUND_EVENTS[policy_key])
+        return found
+
+    result = PolicyNotFoundResponse(
+        policy_type_searched=policy_type,
+        available_policies=list(POLICIES),
+        message=f"Policy '{policy_type}' not found.",
+    )
+    stream.data(
+        {
+            "tool": "get_policy",
+            "event_type": "policy_info",
+            "policy_type": policy_key,
+            "found": result.found,
+            "payload": result,
+        }
+    )
+
+    return result
+
 
 # =============================================================================
 # Agent Implementation
@@ -938,164 +1320,33 @@ class OutdoorShopAgent(BaseLayercodeAgent):
 
     name = "outdoor_shop"
     description = "Outdoor gear e-commerce customer service with complex data responses"
+    PER_SESSION_STATE = False
+    _WELCOME_JSON: ClassVar[bytes] = to_json("Nimbus Gear support. How can I help?")
 
-    def __init__(self, model: str) -> None:
-        super().__init__(model)
-
-        prompt = load_prompt(PROMPTS_DIR / "outdoor_shop.txt", meta="strict")
-        system_prompt = str(prompt.prompt)
-
-        model_settings = None
-        if model == "openai:gpt-5-nano":
-            model_settings = OpenAIChatModelSettings(openai_reasoning_effort="minimal")
+    # PydanticAI agents are built once per model and shared across instances
+    _agents: ClassVar[dict[str, PydanticAgent[StreamHelper, str]]] = {}
 
-        self._agent = PydanticAgent(
-            model,
-            system_prompt=system_prompt,
-            deps_type=StreamHelper,
-            model_settings=model_settings,
-        )
+    __slots__ = ("_agent",)
 
-        @self._agent.tool
-        async def search_products(
-            ctx: RunContext[StreamHelper],
-            query: str,
-            category: str | None = None,
-            max_results: int = 3,
-        ) -> ProductSearchResults:
-            """Search the product catalog by keyword and optional category.
-
-            Note: This is a simplified demo. If no exact matches are found, returns
-            a sample of products from the catalog to ensure non-empty results for
-            testing purposes.
-
-            Args:
-                query: Search terms (e.g., 'ultralight tent', 'rain jacket')
-                category: Optional filter: tents, backpacks, sleeping_bags, apparel
-                max_results: Maximum products to return (default 3)
-            """
-            stream = ctx.deps
-            query_lower = query.lower()
-
-            matches: list[Product] = []
-            for product in PRODUCT_CATALOG.values():
-                if category and product.category != category.lower():
-                    continue
-                searchable = f"{product.name} {product.description} {product.category}"
-                if query_lower in searchable.lower():
-                    matches.append(product)
-                if len(matches) >= max_results:
-                    break
-
-            # Fallback: return sample products when no matches found (demo simplification)
-            if not matches:
-                for product in PRODUCT_CATALOG.values():
-                    if category and product.category != category.lower():
-                        continue
-                    matches.append(product)
-                    if len(matches) >= max_results:
-                        break
-
-            result = ProductSearchResults(
-                query=query,
-                category_filter=category,
-                results_count=len(matches),
-                products=matches,
-                suggested_filters=_get_suggested_filters(matches),
-            )
-
-            stream.data(
-                {
-                    "tool": "search_products",
-                    "event_type": "product_catalog",
-                    "query": query,
-                    "results_count": len(matches),
-                    "payload": result.model_dump(),
-                }
-            )
-
-            return result
-
-        @self._agent.tool
-        async def lookup_order(
-            ctx: RunContext[StreamHelper],
-            order_number: str,
-        ) -> OrderFoundResponse | OrderNotFoundResponse:
-            """Look up order status and tracking information.
-
-            Args:
-                order_number: The order ID (e.g., 'NG-2025-78234')
-            """
-            stream = ctx.deps
-            order_upper = order_number.upper().strip()
-
-            if order_upper in ORDERS_DB:
-                order = ORDERS_DB[order_upper]
-                result: OrderFoundResponse | OrderNotFoundResponse = OrderFoundResponse(
-                    order=order,
-                    actions_available=_get_available_actions(order),
-                    support_note="For modifications, contact support@nimbusgear.com",
-                )
-            else:
-                result = OrderNotFoundResponse(
-                    order_number_searched=order_upper,
-                    message="Order not found. Please verify the order number.",
-                    help=OrderNotFoundHelp(
-                        format_hint="Order numbers start with 'NG-' followed by year and number",
-                        example="NG-2024-12345",
-                        contact="support@nimbusgear.com",
-                    ),
-                )
-
-            stream.data(
-                {
-                    "tool": "lookup_order",
-                    "event_type": "order_tracking",
-                    "order_number": order_upper,
-                    "found": result.found,
-                    "payload": result.model_dump(),
-                }
-            )
-
-            return result
-
-        @self._agent.tool
-        async def get_policy(
-            ctx: RunContext[StreamHelper],
-            policy_type: str,
-        ) -> PolicyFoundResponse | PolicyNotFoundResponse:
-            """Retrieve store policy information.
-
-            Args:
-                policy_type: Type of policy: 'returns', 'shipping', or 'warranty'
-            """
-            stream = ctx.deps
-            policy_key = policy_type.lower().strip()
-
-            if policy_key in POLICIES:
-                policy = POLICIES[policy_key]
-                result: PolicyFoundResponse | PolicyNotFoundResponse = PolicyFoundResponse(
-                    policy=policy,
-                    related_policies=[p for p in POLICIES.keys() if p != policy_key],
-                )
-            else:
-                result = PolicyNotFoundResponse(
-                    policy_type_searched=policy_type,
-                    available_policies=list(POLICIES.keys()),
-                    message=f"Policy '{policy_type}' not found.",
-                )
-
-            stream.data(
-                {
-                    "tool": "get_policy",
-                    "event_type": "policy_info",
-                    "policy_type": policy_key,
-                    "found": result.found,
-                    "payload": result.model_dump(),
-                }
+    def __init__(self, model: str) -> None:
+        super().__init__(model)
+        self._agent = self._get_agent(model)
+
+    @classmethod
+    def _get_agent(cls, model: str) -> PydanticAgent[StreamHelper, str]:
+        """Return the shared PydanticAI agent for a model, building it on first use."""
+
+        pydantic_agent = cls._agents.get(model)
+        if pydantic_agent is None:
+            pydantic_agent = PydanticAgent(
+                model,
+                system_prompt=load_system_prompt("outdoor_shop.txt"),
+                deps_type=StreamHelper,
+                model_settings=model_settings_for(model),
+                tools=[search_products, lookup_order, get_policy],
             )
-
-            return result
+            cls._agents[model] = pydantic_agent
+        return pydantic_agent
 
     def pydantic_agent(self) -> object | None:
         return self._agent
@@ -1103,7 +1354,7 @@ class OutdoorShopAgent(BaseLayercodeAgent):
     async def handle_session_start(
         self, payload: SessionStartPayload, stream: StreamHelper
     ) -> None:
-        stream.tts("Nimbus Gear support. How can I help?")
+        stream.tts_json(self._WELCOME_JSON)
         stream.end()
 
     async def handle_message(
@@ -1121,11 +1372,13 @@ class OutdoorShopAgent(BaseLayercodeAgent):
                     streamed = True
                     stream.tts(chunk)
 
-            final_text = await run.get_output()
-            if final_text and not streamed:
-                stream.tts(final_text)
+            # The output is only needed when no deltas arrived to speak it already
+            if not streamed:
+                final_text = await run.get_output()
+                if final_text:
+                    stream.tts(final_text)
 
-            new_messages = list(run.new_messages())
+            new_messages = run.new_messages()
 
         stream.end()
         return new_messages
@@ -1134,25 +1387,16 @@ class OutdoorShopAgent(BaseLayercodeAgent):
         pass
 
 
-def _get_suggested_filters(products: list[Product]) -> list[str]:
-    """Generate suggested filters based on search results."""
+@lru_cache(maxsize=256)
+def _get_suggested_filters(positions: frozenset[int]) -> tuple[str, ...]:
+    """Generate suggested filters based on search results, memoized per result set."""
     filters: set[str] = set()
-    for p in products:
-        if p.specifications.season_rating:
-            filters.add(p.specifications.season_rating)
-        if p.specifications.capacity:
-            filters.add(f"{p.specifications.capacity}-person")
-        filters.add(p.category)
-    return sorted(filters)[:5]
-
-
-def _get_available_actions(order: Order) -> list[str]:
-    """Determine available actions based on order status."""
-    actions = ["contact_support"]
-    if order.status in ("shipped", "in_transit"):
-        actions.insert(0, "track_package")
-    if order.status == "processing":
-        actions.insert(0, "request_cancellation")
-    if order.status == "delivered":
-        actions.insert(0, "initiate_return")
-    return actions
+    for index in positions:
+        season_rating = _PRODUCT_SEASON_RATINGS[index]
+        if season_rating:
+            filters.add(season_rating)
+        capacity = _PRODUCT_CAPACITIES[index]
+        if capacity:
+            filters.add(f"{capacity}-person")
+        filters.add(_PRODUCT_CATEGORIES[index])
+    return tuple(sorted(filters)[:5])
@@ -18,8 +18,10 @@ Run with:
 from __future__ import annotations
 
 import asyncio
+from typing import ClassVar
 
 from pydantic_ai.messages import ModelMessage
+from pydantic_core import to_json
 
 from ..sdk.events import MessagePayload, SessionEndPayload, SessionStartPayload
 from ..sdk.stream import StreamHelper
@@ -34,6 +36,24 @@ class SlowAgent(BaseLayercodeAgent):
     description = (
         "Testing agent that responds in 3 parts over ~10 seconds (for wait/timeout testing)"
     )
+    PER_SESSION_STATE = False
+
+    _WELCOME_JSON: ClassVar[bytes] = to_json(
+        "Welcome! I'm a slow agent. "
+        "Every response takes a bit longer than usual with updates along the way."
+    )
+
+    # (seconds after the turn starts, TTS text, data content), JSON-encoded once
+    _STEPS: ClassVar[tuple[tuple[float, bytes, bytes], ...]] = tuple(
+        (offset, to_json(text), to_json({"status": status, "progress": progress}))
+        for offset, text, status, progress in (
+            (0, "Processing your request now. Please wait 5 seconds.", "loading", 0),
+            (5, " Still working. Please wait 5 more seconds.", "processing", 50),
+            (10, " Done! Your request has been processed successfully.", "complete", 100),
+        )
+    )
+
+    __slots__ = ()
 
     def __init__(self, model: str) -> None:
         super().__init__(model)
@@ -41,10 +61,7 @@ class SlowAgent(BaseLayercodeAgent):
     async def handle_session_start(
         self, payload: SessionStartPayload, stream: StreamHelper
     ) -> None:
-        stream.tts(
-            "Welcome! I'm a slow agent. "
-            "Every response takes a bit longer than usual with updates along the way."
-        )
+        stream.tts_json(self._WELCOME_JSON)
         stream.end()
 
     async def handle_message(
@@ -53,22 +70,17 @@ class SlowAgent(BaseLayercodeAgent):
         stream: StreamHelper,
         history: list[ModelMessage],
     ) -> list[ModelMessage]:
-        # Part 1: Acknowledge and start loading
-        stream.tts("Processing your request now. Please wait 5 seconds.")
-        stream.data({"status": "loading", "progress": 0})
-
-        await asyncio.sleep(5)
-
-        # Part 2: Progress update
-        stream.tts(" Still working. Please wait 5 more seconds.")
-        stream.data({"status": "processing", "progress": 50})
-
-        await asyncio.sleep(5)
-
-        # Part 3: Complete
-        stream.tts(" Done! Your request has been processed successfully.")
-        stream.data({"status": "complete", "progress": 100})
-        stream.end()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            for offset, text_json, data_json in self._STEPS:
+                # Sleep until each step's deadline so emit time never adds drift
+                await asyncio.sleep(max(0.0, start + offset - loop.time()))
+                stream.tts_json(text_json)
+                stream.data_json(data_json)
+        finally:
+            # Close the stream even if the turn is cancelled mid-wait
+            stream.end()
 
         return []
 
@@ -2,18 +2,15 @@
 
 from __future__ import annotations
 
-from pathlib import Path
+from typing import ClassVar
 
 from pydantic_ai import Agent as PydanticAgent
 from pydantic_ai.messages import ModelMessage
-from pydantic_ai.models.openai import OpenAIChatModelSettings
-from textprompts import load_prompt
+from pydantic_core import to_json
 
 from ..sdk.events import MessagePayload, SessionEndPayload, SessionStartPayload
-from ..sdk.stream import StreamHelper
-from .base import BaseLayercodeAgent, agent
-
-PROMPTS_DIR = Path(__file__).resolve().parent / "prompts"
+from ..sdk.stream import StreamHelper, TtsBatcher
+from .base import BaseLayercodeAgent, agent, load_system_prompt, model_settings_for
 
 
 @agent("starter")
@@ -22,21 +19,34 @@ class StarterAgent(BaseLayercodeAgent):
 
     name = "starter"
     description = "Concise conversational agent"
+    PER_SESSION_STATE = False
+    # Seconds a buffered TTS delta may wait for more text before it is spoken
+    _TTS_MAX_DELAY: ClassVar[float] = 0.05
+
+    _WELCOME_JSON: ClassVar[bytes] = to_json("Hi there! How can I help today?")
+
+    # PydanticAI agents are built once per model and shared across instances
+    _agents: ClassVar[dict[str, PydanticAgent[None, str]]] = {}
+
+    __slots__ = ("_agent",)
 
     def __init__(self, model: str) -> None:
         super().__init__(model)
-        prompt = load_prompt(PROMPTS_DIR / "starter.txt", meta="strict")
-        system_prompt = str(prompt.prompt)
-        self._welcome = "Hi there! How can I help today?"
-        model_settings = None
-        # Configure model settings for OpenAI GPT-5-nano to be even faster
-        if model == "openai:gpt-5-nano":
-            model_settings = OpenAIChatModelSettings(openai_reasoning_effort="minimal")
-        self._agent = PydanticAgent(
-            model,
-            system_prompt=system_prompt,
-            model_settings=model_settings,
-        )
+        self._agent = self._get_agent(model)
+
+    @classmethod
+    def _get_agent(cls, model: str) -> PydanticAgent[None, str]:
+        """Return the shared PydanticAI agent for a model, building it on first use."""
+
+        pydantic_agent = cls._agents.get(model)
+        if pydantic_agent is None:
+            pydantic_agent = PydanticAgent(
+                model,
+                system_prompt=load_system_prompt("starter.txt"),
+                model_settings=model_settings_for(model),
+            )
+            cls._agents[model] = pydantic_agent
+        return pydantic_agent
 
     def pydantic_agent(self) -> object | None:
         return self._agent
@@ -44,7 +54,7 @@ class StarterAgent(BaseLayercodeAgent):
     async def handle_session_start(
         self, payload: SessionStartPayload, stream: StreamHelper
     ) -> None:
-        stream.tts(self._welcome)
+        stream.tts_json(self._WELCOME_JSON)
         stream.end()
 
     async def handle_message(
@@ -56,17 +66,18 @@ class StarterAgent(BaseLayercodeAgent):
         user_text = payload.text or ""
 
         async with self._agent.run_stream(user_text, message_history=history) as run:
-            streamed = False
+            batcher = TtsBatcher(stream, max_delay=self._TTS_MAX_DELAY)
             async for chunk in run.stream_text(delta=True):
-                if chunk:
-                    streamed = True
-                    stream.tts(chunk)
+                batcher.push(chunk)
+            batcher.flush()
 
-            final_text = await run.get_output()
-            if final_text and not streamed:
-                stream.tts(final_text)
+            # The output is only needed when no deltas arrived to speak it already
+            if not batcher.streamed:
+                final_text = await run.get_output()
+                if final_text:
+                    stream.tts(final_text)
 
-            new_messages = list(run.new_messages())
+            new_messages = run.new_messages()
 
         stream.end()
         return new_messages
@@ -5,19 +5,21 @@ from __future__ import annotations
 import argparse
 import asyncio
 import sys
+from collections.abc import Callable
 
 import uvicorn
 from dotenv import load_dotenv
 from loguru import logger
 from pydantic import ValidationError
+from starlette.middleware.gzip import GZipMiddleware
 
-from .agents import available_agents, create_agent
+from .agents import available_agents, create_agent, freeze_registry
 from .agents import bakery as _bakery  # noqa: F401
 from .agents import echo as _echo  # noqa: F401
 from .agents import outdoor_shop as _outdoor_shop  # noqa: F401
 from .agents import slow_agent as _slow_agent  # noqa: F401
 from .agents import starter as _starter  # noqa: F401
-from .config import AppSettings
+from .config import AppSettings, normalize_route
 from .logging import setup_logging
 from .server.app import create_app
 from .tunnel import CloudflareTunnelLauncher
@@ -53,12 +55,17 @@ def run(
         print(f"Configuration error: {exc}")
         sys.exit(1)
 
-    overrides = {
-        "host": host,
-        "port": port,
-        "agent_route": agent_route,
-        "authorize_route": authorize_route,
-    }
+    # model_copy skips validation, so normalize the route overrides here instead
+    try:
+        overrides = {
+            "host": host,
+            "port": port,
+            "agent_route": normalize_route(agent_route),
+            "authorize_route": normalize_route(authorize_route),
+        }
+    except ValueError as exc:
+        print(f"Configuration error: {exc}")
+        sys.exit(1)
 
     if agent_id:
         overrides["layercode_agent_id"] = agent_id
@@ -92,11 +99,14 @@ def run(
     except ValueError as exc:
         print(f"Error: {exc}")
         sys.exit(1)
+    freeze_registry()
 
     log_level = "DEBUG" if verbose else None
     setup_logging(settings, level=log_level)
 
     fastapi_app = create_app(settings, agent_instance)
+    # Compress the JSON endpoints; SSE responses opt out via Content-Encoding: identity
+    fastapi_app.add_middleware(GZipMiddleware, minimum_size=1024)
 
     async def serve() -> None:
         config = uvicorn.Config(
@@ -104,6 +114,11 @@ def run(
             host=settings.host,
             port=settings.port,
             log_level="info",
+            http="httptools",
+            lifespan="on",
+            access_log=False,
+            # Outlive LayerCode's webhook cadence so SSE connections get reused
+            timeout_keep_alive=75,
         )
         server = uvicorn.Server(config)
 
@@ -138,11 +153,24 @@ def run(
             await launcher.stop()
 
     try:
-        asyncio.run(serve())
+        asyncio.run(serve(), loop_factory=_event_loop_factory())
     except KeyboardInterrupt:  # pragma: no cover - handled during manual runs
         print("\nShutting down...")
 
 
+def _event_loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Return uvloop's loop factory when installed, else None for the default loop.
+
+    uvicorn's `loop=` setting only applies when uvicorn owns the loop, so we pick it here.
+    """
+
+    try:
+        import uvloop
+    except ImportError:  # pragma: no cover - uvloop is unavailable on Windows
+        return None
+    return uvloop.new_event_loop
+
+
 def main() -> None:
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -31,7 +31,16 @@ class AppSettings(BaseSettings):
     @classmethod
     def validate_route(cls, value: str) -> str:
         """Ensure routes start with a slash for FastAPI compatibility."""
-        if not value.startswith("/"):
-            msg = "Route paths must start with '/'"
-            raise ValueError(msg)
-        return value.rstrip("/") or "/"
+        return normalize_route(value)
+
+
+def normalize_route(value: str) -> str:
+    """Return a route path without trailing slashes, rejecting paths without a leading one.
+
+    Shared with the CLI so overrides can be normalized before `model_copy`, which does
+    not re-run field validators.
+    """
+    if not value.startswith("/"):
+        msg = "Route paths must start with '/'"
+        raise ValueError(msg)
+    return value.rstrip("/") or "/"
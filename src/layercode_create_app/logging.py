@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import sys
 from typing import Any
 
 import logfire
@@ -17,16 +18,26 @@ def setup_logging(settings: AppSettings, level: str | None = None) -> None:
     logger.remove()
     log_level_env = os.getenv("LOG_LEVEL")
     log_level = level or log_level_env or "INFO"
+    # Write straight to stdout from loguru's worker thread so request handlers never
+    # block on log I/O; extended backtraces are skipped to keep error logging cheap.
     logger.add(
-        sink=lambda message: print(message, end=""),
+        sink=sys.stdout,
         level=log_level,
         colorize=False,
-        backtrace=True,
+        backtrace=False,
         diagnose=False,
+        enqueue=True,
     )
 
-    # Always configure logfire (auto-disables if no token present)
+    # Logfire installs an OpenTelemetry tracer provider and wraps every PydanticAI
+    # call in spans, so only pay that cost when there is somewhere to send them.
+    # Without a token, OpenTelemetry's default proxy tracer stays a no-op.
+    token = _logfire_token(settings)
+    if token is None:
+        return
+
     logfire.configure(
+        token=token,
         scrubbing=False,
         send_to_logfire="if-token-present",
         service_name="server",
@@ -38,5 +49,11 @@ def setup_logging(settings: AppSettings, level: str | None = None) -> None:
 
 
 def instrument_fastapi(app: Any, settings: AppSettings) -> None:
-    """Instrument FastAPI application with Logfire."""
+    """Instrument FastAPI application with Logfire when a token is configured."""
+    if _logfire_token(settings) is None:
+        return
     logfire.instrument_fastapi(app)
+
+
+def _logfire_token(settings: AppSettings) -> str | None:
+    return settings.logfire_token or os.getenv("LOGFIRE_TOKEN") or None
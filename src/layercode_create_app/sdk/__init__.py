@@ -1,6 +1,6 @@
 """LayerCode SDK helpers."""
 
-from .auth import InvalidSignatureError, verify_signature
+from .auth import InvalidSignatureError, signing_key, verify_signature
 from .events import (
     DataPayload,
     LayercodeEventType,
@@ -11,7 +11,7 @@ from .events import (
     TranscriptItem,
     parse_webhook_payload,
 )
-from .stream import StreamHelper, stream_response
+from .stream import StreamHelper, TtsBatcher, stream_response
 
 __all__ = [
     "DataPayload",
@@ -23,7 +23,9 @@ __all__ = [
     "SessionUpdatePayload",
     "StreamHelper",
     "TranscriptItem",
+    "TtsBatcher",
     "parse_webhook_payload",
+    "signing_key",
     "stream_response",
     "verify_signature",
 ]
@@ -5,34 +5,85 @@ from __future__ import annotations
 import hashlib
 import hmac
 import time
-from dataclasses import dataclass
+from functools import lru_cache
 
 
-@dataclass(slots=True)
 class InvalidSignatureError(Exception):
     """Raised when a LayerCode webhook signature verification fails."""
 
-    reason: str
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
 
     def __str__(self) -> str:
         return f"Invalid signature: {self.reason}"
 
 
+def signing_key(secret: str | bytes) -> hmac.HMAC:
+    """Return a keyed HMAC-SHA256 for `secret` that `verify_signature` can reuse."""
+
+    if isinstance(secret, str):
+        secret = secret.encode("utf-8")
+    return hmac.new(secret, digestmod=hashlib.sha256)
+
+
+# Private so callers never receive (and mutate) a shared template; most deployments use
+# a single webhook secret
+_cached_signing_key = lru_cache(maxsize=8)(signing_key)
+
+
 def verify_signature(
-    payload: str,
+    payload: str | bytes,
     signature: str,
-    secret: str,
+    secret: str | bytes | hmac.HMAC,
     tolerance_seconds: int = 300,
 ) -> None:
-    """Verify LayerCode webhook signature, raising InvalidSignatureError if invalid."""
+    """Verify LayerCode webhook signature, raising InvalidSignatureError if invalid.
 
-    try:
-        components = dict(item.split("=", 1) for item in signature.split(","))
-    except ValueError as exc:
-        raise InvalidSignatureError("Malformed signature header") from exc
+    `payload` and `secret` may be passed pre-encoded as UTF-8 bytes to skip re-encoding.
+    `secret` may also be a keyed HMAC from `signing_key`; raw secrets are keyed once
+    and cached internally, so either form skips per-call key derivation.
+    """
+
+    signed_prefix, timestamp, provided_digest = _parse_signature_header(signature)
+
+    current_time = time.time_ns() // 1_000_000_000
+    if abs(current_time - timestamp) > tolerance_seconds:
+        raise InvalidSignatureError("Signature timestamp outside tolerance window")
 
-    timestamp_str = components.get("t")
-    provided_sig = components.get("v1")
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    # Raw secrets are keyed once and cached, so repeat calls only copy the keyed state
+    mac = (secret if isinstance(secret, hmac.HMAC) else _cached_signing_key(secret)).copy()
+    # Feed `<timestamp>.` and the body separately rather than copying the body into one buffer
+    mac.update(signed_prefix)
+    mac.update(payload)
+    expected_digest = mac.digest()
+
+    if not hmac.compare_digest(expected_digest, provided_digest):
+        raise InvalidSignatureError("Signature mismatch")
+
+
+@lru_cache(maxsize=1024)
+def _parse_signature_header(signature: str) -> tuple[bytes, int, bytes]:
+    """Split a `t=...,v1=...` header into the signed `<timestamp>.` prefix, timestamp and digest.
+
+    Cached so retried deliveries carrying the same header skip re-parsing; failures raise
+    and are therefore never cached.
+    """
+
+    timestamp_str: str | None = None
+    provided_sig: str | None = None
+    for item in signature.split(","):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise InvalidSignatureError("Malformed signature header")
+        if key == "t":
+            timestamp_str = value
+        elif key == "v1":
+            provided_sig = value
+        if timestamp_str and provided_sig:
+            break
 
     if not timestamp_str or not provided_sig:
         raise InvalidSignatureError("Signature header missing required fields")
@@ -42,12 +93,9 @@ def verify_signature(
     except ValueError as exc:
         raise InvalidSignatureError("Invalid timestamp in signature header") from exc
 
-    current_time = int(time.time())
-    if abs(current_time - timestamp) > tolerance_seconds:
-        raise InvalidSignatureError("Signature timestamp outside tolerance window")
-
-    signed_payload = timestamp_str.encode("utf-8") + b"." + payload.encode("utf-8")
-    expected_sig = hmac.new(secret.encode("utf-8"), signed_payload, hashlib.sha256).hexdigest()
+    try:
+        provided_digest = bytes.fromhex(provided_sig)
+    except ValueError as exc:
+        raise InvalidSignatureError("Malformed v1 signature") from exc
 
-    if not hmac.compare_digest(expected_sig, provided_sig):
-        raise InvalidSignatureError("Signature mismatch")
+    return f"{timestamp_str}.".encode(), timestamp, provided_digest
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Any, Literal
+from typing import Annotated, Any, Literal, cast
 
 from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
@@ -104,10 +104,32 @@ WebhookPayload = (
 )
 
 
-_WEBHOOK_PAYLOAD_ADAPTER: TypeAdapter[WebhookPayload] = TypeAdapter(WebhookPayload)
-
-
-def parse_webhook_payload(data: dict[str, Any]) -> WebhookPayload:
-    """Validate raw webhook payload into the appropriate typed model."""
+# Tagged on `type` so pydantic-core dispatches straight to the matching model
+_WEBHOOK_PAYLOAD_ADAPTER: TypeAdapter[WebhookPayload] = TypeAdapter(
+    Annotated[WebhookPayload, Field(discriminator="type")]
+)
 
-    return _WEBHOOK_PAYLOAD_ADAPTER.validate_python(data)
+# Dicts already expose their tag, so validate against the one matching model directly;
+# unknown tags fall through to the union adapter for its error reporting.
+_PAYLOAD_MODEL_BY_TYPE: dict[str, type[BaseWebhookPayload]] = {
+    LayercodeEventType.SESSION_START.value: SessionStartPayload,
+    LayercodeEventType.MESSAGE.value: MessagePayload,
+    LayercodeEventType.DATA.value: DataPayload,
+    LayercodeEventType.SESSION_END.value: SessionEndPayload,
+    LayercodeEventType.SESSION_UPDATE.value: SessionUpdatePayload,
+}
+
+
+def parse_webhook_payload(data: dict[str, Any] | str | bytes) -> WebhookPayload:
+    """Validate raw webhook payload into the appropriate typed model.
+
+    Raw JSON (`str`/`bytes`) is parsed by pydantic-core directly, without `json.loads`.
+    """
+
+    if isinstance(data, dict):
+        tag = data.get("type")
+        model = _PAYLOAD_MODEL_BY_TYPE.get(tag) if isinstance(tag, str) else None
+        if model is not None:
+            return cast(WebhookPayload, model.model_validate(data))
+        return _WEBHOOK_PAYLOAD_ADAPTER.validate_python(data)
+    return _WEBHOOK_PAYLOAD_ADAPTER.validate_json(data)
@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 import asyncio
-import json
+from collections import deque
 from collections.abc import AsyncIterator, Awaitable, Callable
 from typing import Any, Protocol
 
 from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
 
 
 class Encoder(Protocol):
@@ -32,61 +33,150 @@ class StreamHelper:
         self._encoder = encoder
         self._controller = controller
         self._closed = False
-
-    def _emit(self, event_type: str, content: dict[str, Any]) -> None:
-        payload = {"type": event_type, "turn_id": self._turn_id, **content}
-        data = f"data: {json.dumps(payload, separators=(',', ':'))}\n\n"
-        self._controller.enqueue(self._encoder.encode(data))
+        # Each helper serves one turn, so the frame envelopes are encoded once up front
+        # and every event is a single bytes concatenation around the JSON content.
+        turn_json = to_json(turn_id).decode("utf-8")
+        self._tts_prefix = encoder.encode(
+            f'data: {{"type":"response.tts","turn_id":{turn_json},"content":'
+        )
+        self._data_prefix = encoder.encode(
+            f'data: {{"type":"response.data","turn_id":{turn_json},"content":'
+        )
+        self._end_frame = encoder.encode(
+            f'data: {{"type":"response.end","turn_id":{turn_json}}}\n\n'
+        )
+        self._frame_suffix = encoder.encode("}\n\n")
+
+    def _emit_json(self, prefix: bytes, content: bytes) -> None:
+        self._controller.enqueue(prefix + content + self._frame_suffix)
 
     def tts(self, content: str) -> None:
         """Emit a TTS chunk."""
 
-        self._emit("response.tts", {"content": content})
+        # Hot path: only the text varies, so encode just that into the cached prefix
+        self._emit_json(self._tts_prefix, to_json(content))
+
+    def tts_json(self, content: bytes) -> None:
+        """Emit a TTS chunk whose text is already JSON-encoded (e.g. a cached greeting)."""
+
+        self._emit_json(self._tts_prefix, content)
 
     def data(self, content: dict[str, Any]) -> None:
-        """Emit a data payload (tool calls, metadata, etc.)."""
+        """Emit a data payload (tool calls, metadata, etc.).
+
+        Values may include Pydantic models, which are serialized directly by pydantic-core.
+        """
+
+        # Serialize only the content; the event envelope is the cached prefix
+        self._emit_json(self._data_prefix, to_json(content))
 
-        self._emit("response.data", {"content": content})
+    def data_json(self, content: bytes) -> None:
+        """Emit a data payload whose content is already JSON-encoded.
+
+        Lets callers cache the encoded bytes of static payloads instead of re-serializing.
+        """
+
+        self._emit_json(self._data_prefix, content)
 
     def end(self) -> None:
         """Signal the end of the stream."""
 
         if not self._closed:
-            self._emit("response.end", {})
+            self._controller.enqueue(self._end_frame)
             self._controller.close()
             self._closed = True
 
 
-async def stream_response(
-    request_body: dict[str, Any],
-    handler: Callable[[StreamHelper], Awaitable[None]],
-) -> StreamingResponse:
-    """Create a FastAPI StreamingResponse compatible with LayerCode SSE."""
+class TtsBatcher:
+    """Coalesce streamed TTS deltas into fewer, sentence-sized `response.tts` events."""
 
-    turn_id = str(request_body.get("turn_id", ""))
+    _BOUNDARIES = (".", "?", "!")
 
-    class UTF8Encoder:
-        def encode(self, text: str) -> bytes:
-            return text.encode("utf-8")
+    def __init__(
+        self, stream: StreamHelper, max_chars: int = 64, max_delay: float | None = None
+    ) -> None:
+        self._stream = stream
+        self._max_chars = max_chars
+        self._max_delay = max_delay
+        self._timer: asyncio.TimerHandle | None = None
+        self._parts: list[str] = []
+        self._size = 0
+        self.streamed = False
 
-    encoder = UTF8Encoder()
+    def push(self, chunk: str) -> None:
+        """Buffer a delta, flushing on a sentence boundary or once the buffer is full.
 
-    queue: asyncio.Queue[bytes] = asyncio.Queue()
+        With `max_delay` set, buffered text is also flushed that many seconds after the
+        first delta arrived, so a slow stream never holds speech back for long.
+        Empty deltas are ignored; `streamed` becomes True once any text was pushed.
+        """
 
-    class QueueController:
-        def __init__(self) -> None:
-            self._closed = False
+        if not chunk:
+            return
+        self.streamed = True
+        if not self._parts and self._max_delay is not None:
+            self._timer = asyncio.get_running_loop().call_later(self._max_delay, self.flush)
+        self._parts.append(chunk)
+        self._size += len(chunk)
+        if (
+            self._size >= self._max_chars
+            or "\n" in chunk
+            or chunk.rstrip().endswith(self._BOUNDARIES)
+        ):
+            self.flush()
 
-        def enqueue(self, data: bytes) -> None:
-            if not self._closed:
-                queue.put_nowait(data)
+    def flush(self) -> None:
+        """Emit any buffered text as a single TTS chunk."""
 
-        def close(self) -> None:
-            self._closed = True
-            queue.put_nowait(b"")
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._parts:
+            self._stream.tts("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+
+
+class _UTF8Encoder:
+    __slots__ = ()
+
+    def encode(self, text: str) -> bytes:
+        return text.encode("utf-8")
+
+
+_UTF8_ENCODER = _UTF8Encoder()
+
+
+class _BufferController:
+    """Frames enqueued within one event-loop tick are drained into a single write."""
+
+    __slots__ = ("closed", "pending", "ready")
+
+    def __init__(self) -> None:
+        self.closed = False
+        self.pending: deque[bytes] = deque()
+        self.ready = asyncio.Event()
+
+    def enqueue(self, data: bytes) -> None:
+        if not self.closed:
+            self.pending.append(data)
+            self.ready.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self.ready.set()
+
+
+async def stream_response(
+    request_body: dict[str, Any],
+    handler: Callable[[StreamHelper], Awaitable[None]],
+) -> StreamingResponse:
+    """Create a FastAPI StreamingResponse compatible with LayerCode SSE."""
+
+    turn_id = str(request_body.get("turn_id", ""))
 
-    controller = QueueController()
-    stream = StreamHelper(turn_id, encoder, controller)
+    controller = _BufferController()
+    stream = StreamHelper(turn_id, _UTF8_ENCODER, controller)
 
     async def producer() -> None:
         try:
@@ -99,17 +189,24 @@ async def stream_response(
     async def generator() -> AsyncIterator[bytes]:
         producer_task = asyncio.create_task(producer())
         try:
+            pending = controller.pending
+            ready = controller.ready
             while True:
-                chunk = await queue.get()
-                if chunk == b"":
+                await ready.wait()
+                ready.clear()
+                if pending:
+                    chunk = b"".join(pending)
+                    pending.clear()
+                    yield chunk
+                if controller.closed and not pending:
                     break
-                yield chunk
         finally:
             await producer_task
 
     headers = {
         "Content-Type": "text/event-stream",
         "Cache-Control": "no-cache, no-transform",
+        "Content-Encoding": "identity",
         "Connection": "keep-alive",
         "X-Accel-Buffering": "no",
     }
@@ -2,8 +2,7 @@
 
 from __future__ import annotations
 
-import json
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import asynccontextmanager
 from typing import Any, cast
 
@@ -11,14 +10,16 @@ import httpx
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.responses import JSONResponse, Response
 from loguru import logger
+from pydantic import ValidationError
 from pydantic_ai.messages import ModelMessage
 
-from ..agents.base import BaseLayercodeAgent
+from ..agents.base import BaseLayercodeAgent, preload_prompts
 from ..config import AppSettings
 from ..logging import instrument_fastapi
 from ..sdk import (
     InvalidSignatureError,
     parse_webhook_payload,
+    signing_key,
     stream_response,
     verify_signature,
 )
@@ -40,11 +41,21 @@ def create_app(settings: AppSettings, agent: BaseLayercodeAgent) -> FastAPI:
     """Create a configured FastAPI application."""
 
     conversation_store = ConversationStore()
+    # Keyed once so signature checks do not re-derive the HMAC key per webhook
+    webhook_secret = settings.layercode_webhook_secret
+    webhook_key = signing_key(webhook_secret) if webhook_secret else None
 
     @asynccontextmanager
     async def lifespan(app: FastAPI) -> AsyncIterator[None]:
-        client = httpx.AsyncClient(timeout=httpx.Timeout(15.0, connect=5.0))
+        # Keep warm connections to the LayerCode API so /authorize skips TLS handshakes
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(15.0, connect=5.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=50, max_connections=100, keepalive_expiry=60.0
+            ),
+        )
         app.state.http_client = client
+        await preload_prompts()
         logger.info(f"FastAPI application starting on {settings.host}:{settings.port}")
         yield
         await client.aclose()
@@ -61,20 +72,11 @@ def create_app(settings: AppSettings, agent: BaseLayercodeAgent) -> FastAPI:
     async def health() -> dict[str, str]:
         return {"status": "ok"}
 
-    async def authorize_payload(request: Request) -> dict[str, Any]:
-        try:
-            data = await request.json()
-        except json.JSONDecodeError as exc:
-            raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid JSON body") from exc
-
-        if not isinstance(data, dict):
-            raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid JSON body")
-
-        return cast(dict[str, Any], data)
-
     @app.post(settings.authorize_route)
     async def authorize_endpoint(request: Request) -> Response:
-        body = await authorize_payload(request)
+        # Proxy the client's JSON body through untouched; LayerCode validates it and its
+        # error status is relayed below.
+        body = await request.body()
         api_key = settings.layercode_api_key
         if not api_key:
             raise HTTPException(
@@ -86,7 +88,7 @@ def create_app(settings: AppSettings, agent: BaseLayercodeAgent) -> FastAPI:
         try:
             response = await client.post(
                 AUTH_ENDPOINT,
-                json=body,
+                content=body,
                 headers={
                     "Authorization": f"Bearer {api_key}",
                     "Content-Type": "application/json",
@@ -104,7 +106,12 @@ def create_app(settings: AppSettings, agent: BaseLayercodeAgent) -> FastAPI:
             raise HTTPException(status.HTTP_502_BAD_GATEWAY, "LayerCode API unreachable") from exc
 
         logger.info("Session authorized for agent")
-        return JSONResponse(status_code=status.HTTP_200_OK, content=response.json())
+        # Relay LayerCode's JSON body as-is instead of decoding and re-encoding it
+        return Response(
+            content=response.content,
+            status_code=status.HTTP_200_OK,
+            media_type=response.headers.get("content-type", "application/json"),
+        )
 
     @app.post(settings.agent_route)
     async def agent_webhook(request: Request) -> Response:
@@ -113,79 +120,69 @@ def create_app(settings: AppSettings, agent: BaseLayercodeAgent) -> FastAPI:
             raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Missing signature header")
 
         body_bytes = await request.body()
-        body_str = body_bytes.decode("utf-8")
 
-        secret = settings.layercode_webhook_secret
-        if not secret:
+        if webhook_key is None:
             raise HTTPException(
                 status.HTTP_500_INTERNAL_SERVER_ERROR,
                 "LAYERCODE_WEBHOOK_SECRET is not configured",
             )
 
         try:
-            verify_signature(body_str, signature, secret)
+            verify_signature(body_bytes, signature, webhook_key)
         except InvalidSignatureError as exc:
             logger.warning(f"Invalid signature: {exc}")
             raise HTTPException(status.HTTP_401_UNAUTHORIZED, str(exc)) from exc
 
         try:
-            payload_dict: dict[str, Any] = json.loads(body_str)
-        except json.JSONDecodeError as exc:
-            raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid JSON body") from exc
-
-        try:
-            payload = parse_webhook_payload(payload_dict)
-        except Exception as exc:
+            payload = parse_webhook_payload(body_bytes)
+        except ValidationError as exc:
+            if exc.errors()[0]["type"] == "json_invalid":
+                raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid JSON body") from exc
             logger.error(f"Payload validation failed: {exc}")
             raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid payload schema") from exc
 
-        logger.info(f"Webhook received: type={payload.type} conversation={payload.conversation_id}")
+        logger.info(
+            "Webhook received: type={} conversation={}", payload.type, payload.conversation_id
+        )
 
-        await conversation_store.acquire_lock(payload.conversation_id)
-        try:
+        # Only session.start and message touch conversation history; the other events
+        # are handled without waiting behind an in-flight turn.
+        handler = _UNLOCKED_HANDLERS.get(payload.type)
+        if handler is not None:
+            return await handler(payload, agent)
+
+        async with conversation_store.lock(payload.conversation_id):
             if payload.type == LayercodeEventType.SESSION_START:
                 return await _handle_session_start(
-                    payload_dict,
                     cast(SessionStartPayload, payload),
                     agent,
                 )
             if payload.type == LayercodeEventType.MESSAGE:
                 history = conversation_store.get(payload.conversation_id)
                 response, new_messages = await _handle_message(
-                    payload_dict,
                     cast(MessagePayload, payload),
                     history,
                     agent,
                 )
                 conversation_store.append(payload.conversation_id, new_messages)
                 return response
-            if payload.type == LayercodeEventType.DATA:
-                return await _handle_data(cast(DataPayload, payload), agent)
-            if payload.type == LayercodeEventType.SESSION_UPDATE:
-                return await _handle_session_update(cast(SessionUpdatePayload, payload), agent)
-            if payload.type == LayercodeEventType.SESSION_END:
-                return await _handle_session_end(cast(SessionEndPayload, payload), agent)
 
             raise HTTPException(status.HTTP_400_BAD_REQUEST, "Unsupported event type")
-        finally:
-            conversation_store.release_lock(payload.conversation_id)
 
     return app
 
 
 async def _handle_session_start(
-    payload_dict: dict[str, Any],
     payload: SessionStartPayload,
     agent: BaseLayercodeAgent,
 ) -> Response:
     async def handler(stream: StreamHelper) -> None:
         await agent.handle_session_start(payload, stream)
 
-    return await stream_response(payload_dict, handler)
+    return await stream_response({"turn_id": payload.turn_id}, handler)
 
 
 async def _handle_message(
-    payload_dict: dict[str, Any],
     payload: MessagePayload,
     history: list[ModelMessage],
     agent: BaseLayercodeAgent,
@@ -196,7 +193,7 @@ async def _handle_message(
         nonlocal new_messages
         new_messages = await agent.handle_message(payload, stream, history)
 
-    response = await stream_response(payload_dict, handler)
+    response = await stream_response({"turn_id": payload.turn_id}, handler)
     return response, new_messages
 
 
@@ -205,7 +202,7 @@ async def _handle_data(
     agent: BaseLayercodeAgent,
 ) -> Response:
     data_keys = list(payload.data.keys()) if payload.data else []
-    logger.info(f"Data event received: session={payload.session_id} keys={data_keys}")
+    logger.info("Data event received: session={} keys={}", payload.session_id, data_keys)
     response_data = await agent.handle_data(payload)
     return JSONResponse(response_data or {"status": "ok"})
 
@@ -215,8 +212,10 @@ async def _handle_session_update(
     agent: BaseLayercodeAgent,
 ) -> Response:
     logger.info(
-        f"Session update: session={payload.session_id} "
-        f"recording_status={payload.recording_status} duration={payload.recording_duration}"
+        "Session update: session={} recording_status={} duration={}",
+        payload.session_id,
+        payload.recording_status,
+        payload.recording_duration,
     )
     await agent.handle_session_update(payload)
     return JSONResponse({"status": "ok"})
@@ -228,8 +227,18 @@ async def _handle_session_end(
 ) -> Response:
     transcript_count = len(payload.transcript) if payload.transcript else 0
     logger.info(
-        f"Session ended: session={payload.session_id} "
-        f"duration={payload.duration}ms transcript_items={transcript_count}"
+        "Session ended: session={} duration={}ms transcript_items={}",
+        payload.session_id,
+        payload.duration,
+        transcript_count,
     )
     await agent.handle_session_end(payload)
     return JSONResponse({"status": "ok"})
+
+
+# Events that never touch conversation history, dispatched by type in one lookup
+_UNLOCKED_HANDLERS: dict[str, Callable[[Any, BaseLayercodeAgent], Awaitable[Response]]] = {
+    LayercodeEventType.DATA: _handle_data,
+    LayercodeEventType.SESSION_UPDATE: _handle_session_update,
+    LayercodeEventType.SESSION_END: _handle_session_end,
+}
@@ -3,44 +3,121 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
-from pydantic_ai.messages import ModelMessage
+from pydantic_ai.messages import ModelMessage, ModelRequest, UserPromptPart
+
+_LOCK_POOL_SIZE = 64
+_MAX_CONVERSATIONS = 1024
+_MAX_HISTORY_MESSAGES = 200
+
+
+class _LockEntry:
+    __slots__ = ("lock", "refs")
+
+    def __init__(self, lock: asyncio.Lock) -> None:
+        self.lock = lock
+        self.refs = 0
 
 
 class ConversationStore:
     """Tracks per-conversation message history with concurrency protection."""
 
     def __init__(self) -> None:
-        self._histories: defaultdict[str, list[ModelMessage]] = defaultdict(list)
-        self._locks: dict[str, asyncio.Lock] = {}
-        self._registry_lock = asyncio.Lock()
+        # Least recently used conversations are evicted past _MAX_CONVERSATIONS
+        self._histories: OrderedDict[str, list[ModelMessage]] = OrderedDict()
+        # Locks are refcounted so dormant conversations don't keep one forever; idle
+        # locks go back to a small pool for the next conversation to reuse.
+        self._locks: dict[str, _LockEntry] = {}
+        self._lock_pool: list[asyncio.Lock] = []
+
+    @asynccontextmanager
+    async def lock(self, conversation_id: str) -> AsyncIterator[None]:
+        """Hold the conversation's lock for the duration of the `async with` block."""
+
+        entry = await self._acquire_entry(conversation_id)
+        try:
+            yield
+        finally:
+            entry.lock.release()
+            self._drop_ref(conversation_id, entry)
 
     async def acquire_lock(self, conversation_id: str) -> asyncio.Lock:
         """Acquire a lock specific to the conversation id."""
 
-        async with self._registry_lock:
-            lock = self._locks.get(conversation_id)
-            if lock is None:
-                lock = asyncio.Lock()
-                self._locks[conversation_id] = lock
-        await lock.acquire()
-        return lock
+        entry = await self._acquire_entry(conversation_id)
+        return entry.lock
 
     def release_lock(self, conversation_id: str) -> None:
         """Release the lock for a conversation if it exists."""
 
-        lock = self._locks.get(conversation_id)
-        if lock and lock.locked():
-            lock.release()
+        entry = self._locks.get(conversation_id)
+        if entry is None:
+            return
+        if entry.lock.locked():
+            entry.lock.release()
+        self._drop_ref(conversation_id, entry)
+
+    async def _acquire_entry(self, conversation_id: str) -> _LockEntry:
+        # Dict operations are atomic on the event loop, so no registry lock is needed
+        entry = self._locks.get(conversation_id)
+        if entry is None:
+            lock = self._lock_pool.pop() if self._lock_pool else asyncio.Lock()
+            entry = self._locks[conversation_id] = _LockEntry(lock)
+        entry.refs += 1
+        try:
+            await entry.lock.acquire()
+        except BaseException:
+            self._drop_ref(conversation_id, entry)
+            raise
+        return entry
+
+    def _drop_ref(self, conversation_id: str, entry: _LockEntry) -> None:
+        entry.refs -= 1
+        if entry.refs == 0:
+            del self._locks[conversation_id]
+            if len(self._lock_pool) < _LOCK_POOL_SIZE:
+                self._lock_pool.append(entry.lock)
 
     def append(self, conversation_id: str, messages: list[ModelMessage]) -> None:
         """Append messages to a conversation history."""
 
-        if messages:
-            self._histories[conversation_id].extend(messages)
+        if not messages:
+            return
+        history = self._histories.get(conversation_id)
+        if history is None:
+            history = self._histories[conversation_id] = []
+            if len(self._histories) > _MAX_CONVERSATIONS:
+                self._histories.popitem(last=False)
+        else:
+            self._histories.move_to_end(conversation_id)
+        history.extend(messages)
+        if len(history) > _MAX_HISTORY_MESSAGES:
+            _trim_history(history)
 
     def get(self, conversation_id: str) -> list[ModelMessage]:
-        """Return history for a conversation id."""
+        """Return history for a conversation id.
+
+        The stored list is returned without copying and must be treated as read-only;
+        PydanticAI copies `message_history` when a run starts.
+        """
+
+        return self._histories.get(conversation_id) or []
+
+
+def _trim_history(history: list[ModelMessage]) -> None:
+    """Drop the oldest turns so at most `_MAX_HISTORY_MESSAGES` remain.
+
+    The cut is made at the start of a user turn so tool calls are never separated from
+    their returns; if no such boundary is in range the history is left for the next turn.
+    """
 
-        return list(self._histories.get(conversation_id, []))
+    for index in range(len(history) - _MAX_HISTORY_MESSAGES, len(history)):
+        message = history[index]
+        if isinstance(message, ModelRequest) and any(
+            isinstance(part, UserPromptPart) for part in message.parts
+        ):
+            del history[:index]
+            return
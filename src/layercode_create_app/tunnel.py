@@ -8,18 +8,27 @@ import re
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, BinaryIO, ClassVar, cast
 
 import httpx
 from loguru import logger
 
-TUNNEL_PATTERN = re.compile(r"https://[a-z0-9-]+\.trycloudflare\.com", re.IGNORECASE)
+TUNNEL_PATTERN = re.compile(r"https://[a-z0-9-]+\.trycloudflare\.com", re.IGNORECASE | re.ASCII)
+# Bytes twin of TUNNEL_PATTERN so candidate lines are matched without decoding
+_TUNNEL_PATTERN_BYTES = re.compile(TUNNEL_PATTERN.pattern.encode("ascii"), re.IGNORECASE)
+# Cheap substring prefilter so the regex only runs on lines that can contain the URL
+_TUNNEL_HOST_MARKER = b".trycloudflare.com"
+# cloudflared output is read in chunks and split locally, not one readline() per line
+_READ_CHUNK_SIZE = 65536
+_LOG_FLUSH_INTERVAL = 1.0
 LAYERCODE_API_BASE = "https://api.layercode.com/v1"
 
 
 class CloudflareTunnelLauncher:
     """Launches a Cloudflare quick tunnel and surfaces the webhook URL."""
 
+    _binary_paths: ClassVar[dict[str, str]] = {}
+
     def __init__(
         self,
         host: str,
@@ -37,13 +46,30 @@ class CloudflareTunnelLauncher:
         self.agent_id = agent_id
         self.api_key = api_key
         self.update_webhook = update_webhook
+        # Derived from the constructor arguments only, so computed once here
+        target_host = "localhost" if host in {"0.0.0.0", ""} else host
+        self._target_url = f"http://{target_host}:{port}"
+        self._webhook_path = agent_route.lstrip("/")
+        self._webhook_url: str | None = None
         self.process: asyncio.subprocess.Process | None = None
-        self._stdout_task: asyncio.Task[None] | None = None
         self._stderr_task: asyncio.Task[None] | None = None
+        self._flush_task: asyncio.Task[None] | None = None
         self._tunnel_url: str | None = None
         self._log_file_handle: Any | None = None
         self._previous_webhook_url: str | None = None
-        self._http_client: httpx.AsyncClient | None = None
+        # One client for the fetch/update/restore calls, keeping its connection warm
+        # across the tunnel's lifetime so restoring the webhook skips a new handshake
+        self._http_client: httpx.AsyncClient | None = (
+            httpx.AsyncClient(
+                timeout=httpx.Timeout(15.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_keepalive_connections=4, max_connections=8, keepalive_expiry=60.0
+                ),
+                headers={"Authorization": f"Bearer {api_key}"},
+            )
+            if agent_id and api_key
+            else None
+        )
 
         # Create log file for tunnel output
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -51,17 +77,11 @@ class CloudflareTunnelLauncher:
 
     async def _get_agent_details(self) -> dict[str, Any] | None:
         """Fetch current agent details from Layercode API."""
-        if not self.agent_id or not self.api_key:
-            return None
-
         if not self._http_client:
-            self._http_client = httpx.AsyncClient(timeout=httpx.Timeout(15.0, connect=5.0))
+            return None
 
         try:
-            response = await self._http_client.get(
-                f"{LAYERCODE_API_BASE}/agents/{self.agent_id}",
-                headers={"Authorization": f"Bearer {self.api_key}"},
-            )
+            response = await self._http_client.get(f"{LAYERCODE_API_BASE}/agents/{self.agent_id}")
             response.raise_for_status()
             return cast(dict[str, Any], response.json())
         except httpx.HTTPStatusError as exc:
@@ -76,19 +96,12 @@ class CloudflareTunnelLauncher:
 
     async def _update_agent_webhook(self, webhook_url: str) -> bool:
         """Update agent webhook URL via Layercode API."""
-        if not self.agent_id or not self.api_key:
-            return False
-
         if not self._http_client:
-            self._http_client = httpx.AsyncClient(timeout=httpx.Timeout(15.0, connect=5.0))
+            return False
 
         try:
             response = await self._http_client.post(
                 f"{LAYERCODE_API_BASE}/agents/{self.agent_id}",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                },
                 json={"webhook_url": webhook_url},
             )
             response.raise_for_status()
@@ -102,92 +115,90 @@ class CloudflareTunnelLauncher:
             logger.error(f"Failed to reach Layercode API: {exc}")
             return False
 
+    @classmethod
+    def _resolve_binary(cls, binary: str) -> str | None:
+        # Found paths are cached across launchers; misses are retried in case it gets installed
+        path = cls._binary_paths.get(binary)
+        if path is None:
+            path = shutil.which(binary)
+            if path is not None:
+                cls._binary_paths[binary] = path
+        return path
+
     async def start(self, timeout_seconds: float = 30.0) -> str:
         """Start the tunnel and return the webhook URL."""
 
-        if shutil.which(self.binary) is None:
+        binary_path = self._resolve_binary(self.binary)
+        if binary_path is None:
             raise RuntimeError(
                 "cloudflared binary not found. Install it from https://developers.cloudflare.com/cloudflare-one/connections/connect-apps/install-and-setup/installation/"
             )
 
-        # Open log file for writing (line-buffered for immediate output)
-        self._log_file_handle = open(  # noqa: ASYNC230
-            self.log_file_path, "w", encoding="utf-8", buffering=1
-        )
+        # Block-buffered binary log: cloudflared output is written as raw bytes, and a
+        # background task flushes it once a second instead of a syscall per line.
+        self._log_file_handle = await asyncio.to_thread(_open_log, self.log_file_path)
         self._log_file_handle.write(
-            f"=== Cloudflare Tunnel Log - {datetime.now().isoformat()} ===\n"
+            (
+                f"=== Cloudflare Tunnel Log - {datetime.now().isoformat()} ===\n"
+                f"Target: http://{self.host}:{self.port}\n"
+                f"Agent route: {self.agent_route}\n" + "=" * 60 + "\n\n"
+            ).encode("utf-8")
         )
-        self._log_file_handle.write(f"Target: http://{self.host}:{self.port}\n")
-        self._log_file_handle.write(f"Agent route: {self.agent_route}\n")
-        self._log_file_handle.write("=" * 60 + "\n\n")
         self._log_file_handle.flush()
-
-        target_host = "localhost" if self.host in {"0.0.0.0", ""} else self.host
-        target = f"http://{target_host}:{self.port}"
+        self._flush_task = asyncio.create_task(self._flush_log_periodically())
 
         logger.info("Starting Cloudflare tunnel...")
         logger.info(f"Tunnel logs: {self.log_file_path.absolute()}")
 
         self.process = await asyncio.create_subprocess_exec(
-            self.binary,
+            binary_path,
             "tunnel",
             "--url",
-            target,
+            self._target_url,
             "--loglevel",
             "debug",
-            stdout=asyncio.subprocess.PIPE,
+            # stdout goes straight into the log file; only stderr passes through Python
+            stdout=self._log_file_handle.fileno(),
             stderr=asyncio.subprocess.PIPE,
         )
 
-        assert self.process.stdout is not None
         assert self.process.stderr is not None
 
-        # Cloudflared outputs the URL to stderr, so we need to monitor both streams
-        url_future: asyncio.Future[str] = asyncio.Future()
-
-        # Store references for type checking
-        stdout = self.process.stdout
-        stderr = self.process.stderr
-
-        async def monitor_streams() -> None:
-            """Monitor both stdout and stderr for the tunnel URL."""
-            stdout_task = asyncio.create_task(self._scan_for_url(stdout, "stdout", url_future))
-            stderr_task = asyncio.create_task(self._scan_for_url(stderr, "stderr", url_future))
-
-            # Wait for either task to find the URL
-            done, pending = await asyncio.wait(
-                {stdout_task, stderr_task}, return_when=asyncio.FIRST_COMPLETED
-            )
+        # Cloudflared outputs the URL to stderr. Its reader task scans until the URL is
+        # found and then just drains to the log, so nothing has to be cancelled.
+        url_future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._stderr_task = asyncio.create_task(
+            self._pump_stream(self.process.stderr, "stderr", url_future)
+        )
 
-            # Cancel the other task
-            for task in pending:
-                task.cancel()
-                with contextlib.suppress(asyncio.CancelledError):
-                    await task
+        # The agent's current webhook doesn't depend on the tunnel URL, so fetch it while
+        # cloudflared is still establishing the tunnel
+        details_task: asyncio.Task[dict[str, Any] | None] | None = None
+        if self.update_webhook and self.agent_id:
+            logger.info(f"Fetching current webhook for agent {self.agent_id}...")
+            details_task = asyncio.create_task(self._get_agent_details())
 
         try:
-            # Start monitoring both streams
-            monitor_task = asyncio.create_task(monitor_streams())
-            tunnel_url = await asyncio.wait_for(url_future, timeout=timeout_seconds)
-            await monitor_task
+            async with asyncio.timeout(timeout_seconds):
+                tunnel_url = await url_future
         except TimeoutError as exc:
+            if details_task is not None:
+                details_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await details_task
             await self.stop()
             raise RuntimeError("Timed out waiting for Cloudflare tunnel URL") from exc
 
-        self._stdout_task = asyncio.create_task(self._drain_stream(self.process.stdout, "stdout"))
-        self._stderr_task = asyncio.create_task(self._drain_stream(self.process.stderr, "stderr"))
-
         self._tunnel_url = tunnel_url
-        webhook_path = self.agent_route.lstrip("/")
-        webhook_url = f"{tunnel_url}/{webhook_path}" if webhook_path else tunnel_url
+        webhook_url = f"{tunnel_url}/{self._webhook_path}" if self._webhook_path else tunnel_url
+        self._webhook_url = webhook_url
 
         logger.info("Tunnel established successfully")
         logger.info(f"Webhook URL: {webhook_url}")
 
         # Update webhook if requested
-        if self.update_webhook and self.agent_id:
-            logger.info(f"Fetching current webhook for agent {self.agent_id}...")
-            agent_details = await self._get_agent_details()
+        if details_task is not None:
+            agent_details = await details_task
             if agent_details:
                 self._previous_webhook_url = agent_details.get("webhook_url")
                 if self._previous_webhook_url:
@@ -208,43 +219,46 @@ class CloudflareTunnelLauncher:
         _print_banner(tunnel_url, webhook_url, self.update_webhook)
         return webhook_url
 
-    async def _scan_for_url(
+    async def _pump_stream(
         self, stream: asyncio.StreamReader, stream_name: str, url_future: asyncio.Future[str]
     ) -> None:
-        """Scan a stream for the tunnel URL and log all output to file only."""
-        try:
-            while True:
-                line = await stream.readline()
-                if not line:
-                    break
-                decoded = line.decode("utf-8", errors="ignore")
-
-                # Write to log file only (not to console)
-                if self._log_file_handle:
-                    self._log_file_handle.write(f"[{stream_name}] {decoded}")
-                    self._log_file_handle.flush()
-
-                # Check if this line contains the tunnel URL
-                match = TUNNEL_PATTERN.search(decoded)
-                if match and not url_future.done():
-                    url = match.group(0)
-                    url_future.set_result(url)
-                    return
-        except asyncio.CancelledError:
-            # This is expected when the URL is found in the other stream
-            pass
-
-    async def _drain_stream(self, stream: asyncio.StreamReader, stream_name: str) -> None:
-        """Drain output from tunnel process and write to log file only."""
+        """Log tunnel output to file only, resolving `url_future` once the URL appears."""
+        prefix = f"[{stream_name}] ".encode()
+        pending = b""
         while True:
-            line = await stream.readline()
-            if not line:
+            chunk = await stream.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                self._write_log_lines(prefix, [pending] if pending else [])
                 break
-            decoded = line.decode("utf-8", errors="ignore")
+            data = pending + chunk
+            lines = data.split(b"\n")
+            pending = lines.pop()
 
             # Write to log file only (not to console)
+            self._write_log_lines(prefix, lines)
+
+            # Check if these lines contain the tunnel URL
+            if url_future.done() or _TUNNEL_HOST_MARKER not in data.lower():
+                continue
+            for line in lines:
+                match = _TUNNEL_PATTERN_BYTES.search(line)
+                if match:
+                    if self._log_file_handle:
+                        self._log_file_handle.flush()
+                    url_future.set_result(match.group(0).decode("ascii"))
+                    break
+
+    def _write_log_lines(self, prefix: bytes, lines: list[bytes]) -> None:
+        if not self._log_file_handle or not lines:
+            return
+        # One join and one replace per chunk rather than formatting each line
+        data = b"\n".join(lines)
+        self._log_file_handle.write(prefix + data.replace(b"\n", b"\n" + prefix) + b"\n")
+
+    async def _flush_log_periodically(self) -> None:
+        while self._log_file_handle:
+            await asyncio.sleep(_LOG_FLUSH_INTERVAL)
             if self._log_file_handle:
-                self._log_file_handle.write(f"[{stream_name}] {decoded}")
                 self._log_file_handle.flush()
 
     async def stop(self) -> None:
@@ -255,12 +269,7 @@ class CloudflareTunnelLauncher:
             agent_details = await self._get_agent_details()
             if agent_details:
                 current_webhook = agent_details.get("webhook_url")
-                webhook_path = self.agent_route.lstrip("/")
-                our_webhook = (
-                    f"{self._tunnel_url}/{webhook_path}" if webhook_path else self._tunnel_url
-                )
-
-                if current_webhook == our_webhook:
+                if current_webhook == self._webhook_url:
                     # Webhook is still ours, restore the previous one
                     if self._previous_webhook_url:
                         logger.info(f"Restoring webhook to {self._previous_webhook_url}")
@@ -290,55 +299,59 @@ class CloudflareTunnelLauncher:
         if self.process and self.process.returncode is None:
             self.process.terminate()
             try:
-                await asyncio.wait_for(self.process.wait(), timeout=5)
+                async with asyncio.timeout(5):
+                    await self.process.wait()
             except TimeoutError:
                 self.process.kill()
                 await self.process.wait()
 
-        for task in (self._stdout_task, self._stderr_task):
-            if task:
-                task.cancel()
-                with contextlib.suppress(asyncio.CancelledError):
-                    await task
+        tasks = [task for task in (self._stderr_task, self._flush_task) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
         # Close log file
         if self._log_file_handle:
             self._log_file_handle.write(
-                f"\n=== Tunnel stopped at {datetime.now().isoformat()} ===\n"
+                f"\n=== Tunnel stopped at {datetime.now().isoformat()} ===\n".encode()
             )
-            self._log_file_handle.close()
-            self._log_file_handle = None
+            handle, self._log_file_handle = self._log_file_handle, None
+            await asyncio.to_thread(handle.close)
             logger.info(f"Tunnel logs saved to: {self.log_file_path.absolute()}")
 
 
+def _open_log(path: Path) -> BinaryIO:
+    return path.open("wb")
+
+
+_BORDER = "=" * 70
+_BANNER_UPDATED = (
+    f"\n\n{_BORDER}\n"
+    f"{_BORDER}\n"
+    "  ✓ CLOUDFLARE TUNNEL ESTABLISHED\n"
+    f"{_BORDER}\n\n"
+    "  Webhook URL: {webhook_url}\n"
+    "  Status: ✓ Webhook automatically updated\n\n"
+    f"{_BORDER}\n"
+    f"{_BORDER}\n\n"
+)
+_BANNER_MANUAL = (
+    f"\n\n{_BORDER}\n"
+    f"{_BORDER}\n"
+    "  ✓ CLOUDFLARE TUNNEL ESTABLISHED\n"
+    f"{_BORDER}\n\n"
+    "  Webhook URL: {webhook_url}\n\n"
+    f"{_BORDER}\n"
+    "  IMPORTANT: Add this webhook URL to your LayerCode agent:\n"
+    "  https://dash.layercode.com/\n\n"
+    "  💡 TIP: Use --unsafe-update-webhook to automatically update\n"
+    "         the webhook for your agent (requires LAYERCODE_AGENT_ID)\n"
+    f"{_BORDER}\n"
+    f"{_BORDER}\n\n"
+)
+
+
 def _print_banner(tunnel_url: str, webhook_url: str, webhook_updated: bool = False) -> None:
     """Print a prominent banner with tunnel URLs."""
-    border = "=" * 70
-
-    if webhook_updated:
-        message = (
-            f"\n\n{border}\n"
-            f"{border}\n"
-            "  ✓ CLOUDFLARE TUNNEL ESTABLISHED\n"
-            f"{border}\n\n"
-            f"  Webhook URL: {webhook_url}\n"
-            "  Status: ✓ Webhook automatically updated\n\n"
-            f"{border}\n"
-            f"{border}\n\n"
-        )
-    else:
-        message = (
-            f"\n\n{border}\n"
-            f"{border}\n"
-            "  ✓ CLOUDFLARE TUNNEL ESTABLISHED\n"
-            f"{border}\n\n"
-            f"  Webhook URL: {webhook_url}\n\n"
-            f"{border}\n"
-            "  IMPORTANT: Add this webhook URL to your LayerCode agent:\n"
-            "  https://dash.layercode.com/\n\n"
-            "  💡 TIP: Use --unsafe-update-webhook to automatically update\n"
-            "         the webhook for your agent (requires LAYERCODE_AGENT_ID)\n"
-            f"{border}\n"
-            f"{border}\n\n"
-        )
-    print(message, flush=True)
+    template = _BANNER_UPDATED if webhook_updated else _BANNER_MANUAL
+    print(template.format(webhook_url=webhook_url), flush=True)
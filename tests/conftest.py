@@ -1,4 +1,7 @@
-"""Test fixtures for LayerCode create app."""
+"""Test fixtures for LayerCode create app.
+
+Payload fixtures are session-scoped and shared across tests, so tests must not mutate them.
+"""
 
 from __future__ import annotations
 
@@ -7,7 +10,7 @@ from typing import Any
 import pytest
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def session_start_payload() -> dict[str, str]:
     return {
         "type": "session.start",
@@ -17,7 +20,7 @@ def session_start_payload() -> dict[str, str]:
     }
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def message_payload() -> dict[str, str]:
     return {
         "type": "message",
@@ -28,7 +31,7 @@ def message_payload() -> dict[str, str]:
     }
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def data_payload() -> dict[str, Any]:
     return {
         "type": "data",
@@ -39,7 +42,7 @@ def data_payload() -> dict[str, Any]:
     }
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def session_update_payload() -> dict[str, Any]:
     """Realistic session.update payload (no turn_id)."""
     return {
@@ -52,7 +55,7 @@ def session_update_payload() -> dict[str, Any]:
     }
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def session_update_failed_payload() -> dict[str, Any]:
     """session.update payload for failed recording."""
     return {
@@ -64,7 +67,7 @@ def session_update_failed_payload() -> dict[str, Any]:
     }
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def session_end_payload() -> dict[str, Any]:
     """Realistic session.end payload (no turn_id)."""
     return {
@@ -88,7 +91,7 @@ def session_end_payload() -> dict[str, Any]:
     }
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def session_end_minimal_payload() -> dict[str, Any]:
     """Minimal session.end payload with only required fields."""
     return {
@@ -0,0 +1,111 @@
+"""Tests for the agent registry."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, cast
+
+import pytest
+
+from layercode_create_app.agents import (
+    PROMPTS_DIR,
+    AgentPool,
+    available_agents,
+    base,
+    create_agent,
+    freeze_registry,
+    load_system_prompt,
+    preload_prompts,
+    register_agent,
+)
+from layercode_create_app.agents import echo as _echo  # noqa: F401
+from layercode_create_app.agents.echo import EchoAgent
+from layercode_create_app.agents.slow_agent import SlowAgent
+from layercode_create_app.agents.starter import StarterAgent
+
+
+def test_create_agent_is_case_insensitive() -> None:
+    agent = create_agent("ECHO", "test")
+    assert isinstance(agent, EchoAgent)
+    assert agent.model == "test"
+
+
+def test_create_agent_unknown_name_lists_available() -> None:
+    with pytest.raises(ValueError) as exc_info:
+        create_agent("does-not-exist", "test")
+    assert "echo" in str(exc_info.value)
+    assert "echo" in available_agents()
+
+
+def test_agent_pool_reuses_stateless_agents() -> None:
+    pool = AgentPool()
+
+    first = pool.get("echo", "test")
+    assert pool.get("ECHO", "test") is first
+    assert pool.get("echo", "other-model") is not first
+
+
+def test_agent_pool_builds_fresh_stateful_agents() -> None:
+    class StatefulAgent(EchoAgent):
+        PER_SESSION_STATE = True
+
+    register_agent("stateful_test", StatefulAgent)
+    pool = AgentPool()
+
+    assert pool.get("stateful_test", "test") is not pool.get("stateful_test", "test")
+
+
+def test_freeze_registry_rejects_new_registrations(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(base, "_REGISTRY", dict(base._REGISTRY))
+
+    freeze_registry()
+
+    assert isinstance(create_agent("echo", "test"), EchoAgent)
+    with pytest.raises(RuntimeError, match="frozen"):
+        register_agent("late_agent", EchoAgent)
+
+
+@pytest.mark.asyncio
+async def test_preload_prompts_warms_prompt_cache() -> None:
+    load_system_prompt.cache_clear()
+
+    await preload_prompts()
+
+    assert load_system_prompt.cache_info().currsize == len(list(PROMPTS_DIR.glob("*.txt")))
+    assert load_system_prompt("starter.txt")
+    assert load_system_prompt.cache_info().hits >= 1
+
+
+@pytest.mark.asyncio
+async def test_slow_agent_ends_stream_when_cancelled() -> None:
+    class StreamRecorder:
+        def __init__(self) -> None:
+            self.events: list[tuple[str, object]] = []
+
+        def tts_json(self, content: bytes) -> None:
+            self.events.append(("tts", json.loads(content)))
+
+        def data_json(self, content: bytes) -> None:
+            self.events.append(("data", json.loads(content)))
+
+        def end(self) -> None:
+            self.events.append(("end", None))
+
+    stream = StreamRecorder()
+    task = asyncio.create_task(
+        SlowAgent("test").handle_message(cast(Any, None), cast(Any, stream), [])
+    )
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert [kind for kind, _ in stream.events] == ["tts", "data", "end"]
+    assert stream.events[1][1] == {"status": "loading", "progress": 0}
+
+
+def test_starter_agents_share_pydantic_agent() -> None:
+    first = StarterAgent("test")
+
+    assert StarterAgent("test").pydantic_agent() is first.pydantic_agent()
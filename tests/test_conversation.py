@@ -0,0 +1,79 @@
+"""Tests for the in-memory conversation store."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    UserPromptPart,
+)
+
+from layercode_create_app.server import conversation
+from layercode_create_app.server.conversation import ConversationStore
+
+
+@pytest.mark.asyncio
+async def test_conversation_lock_serializes_and_is_dropped_when_idle() -> None:
+    store = ConversationStore()
+    order: list[str] = []
+
+    async def turn(name: str) -> None:
+        async with store.lock("conv"):
+            order.append(f"{name}-start")
+            await asyncio.sleep(0)
+            order.append(f"{name}-end")
+
+    await asyncio.gather(turn("a"), turn("b"))
+
+    assert order == ["a-start", "a-end", "b-start", "b-end"]
+    assert "conv" not in store._locks
+
+
+@pytest.mark.asyncio
+async def test_conversation_lock_is_reused_from_pool() -> None:
+    store = ConversationStore()
+
+    first = await store.acquire_lock("one")
+    store.release_lock("one")
+    second = await store.acquire_lock("two")
+
+    assert second is first
+    assert second.locked()
+    store.release_lock("two")
+
+
+def _turn(text: str) -> list[ModelMessage]:
+    return [
+        ModelRequest(parts=[UserPromptPart(content=text)]),
+        ModelResponse(parts=[TextPart(content=f"re: {text}")]),
+    ]
+
+
+def test_conversation_history_trims_oldest_turns(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(conversation, "_MAX_HISTORY_MESSAGES", 4)
+    store = ConversationStore()
+
+    turns = [_turn(text) for text in ("one", "two", "three")]
+    for turn in turns:
+        store.append("conv", turn)
+
+    assert store.get("conv") == turns[1] + turns[2]
+
+
+def test_conversation_store_evicts_least_recently_used(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(conversation, "_MAX_CONVERSATIONS", 2)
+    store = ConversationStore()
+
+    store.append("a", _turn("hi"))
+    store.append("b", _turn("hi"))
+    store.append("a", _turn("again"))
+    store.append("c", _turn("hi"))
+
+    assert store.get("b") == []
+    assert len(store.get("a")) == 4
+    assert len(store.get("c")) == 2
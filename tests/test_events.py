@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 from typing import Any
 
 import pytest
@@ -336,6 +337,17 @@ def test_union_parsing_unknown_type() -> None:
         )
 
 
+def test_union_parsing_non_string_type_raises() -> None:
+    with pytest.raises(ValidationError):
+        parse_webhook_payload({"type": ["message"], "session_id": "s", "conversation_id": "c"})
+
+
+def test_union_parsing_raw_json_bytes(message_payload: dict[str, str]) -> None:
+    payload = parse_webhook_payload(json.dumps(message_payload).encode("utf-8"))
+    assert isinstance(payload, MessagePayload)
+    assert payload.turn_id == message_payload["turn_id"]
+
+
 # =============================================================================
 # Edge Cases and Regression Tests
 # =============================================================================
@@ -0,0 +1,93 @@
+"""Tests for the outdoor_shop agent tools."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from typing import Any, cast
+
+import pytest
+
+from layercode_create_app.agents.outdoor_shop import (
+    ORDERS_DB,
+    POLICIES,
+    PRODUCT_CATALOG,
+    get_policy,
+    lookup_order,
+    search_products,
+)
+
+
+class DataRecorder:
+    def __init__(self) -> None:
+        self.events: list[dict[str, Any]] = []
+
+    def data(self, content: dict[str, Any]) -> None:
+        self.events.append(content)
+
+    def data_json(self, content: bytes) -> None:
+        self.events.append(json.loads(content))
+
+
+def _ctx(recorder: DataRecorder) -> Any:
+    return cast(Any, SimpleNamespace(deps=recorder))
+
+
+@pytest.mark.asyncio
+async def test_search_products_matches_query() -> None:
+    recorder = DataRecorder()
+    result = await search_products(_ctx(recorder), "sleeping bag")
+
+    assert [p.id for p in result.products] == ["SLEEP-DOWN-20"]
+    assert result.results_count == 1
+    assert recorder.events[0]["tool"] == "search_products"
+    assert recorder.events[0]["results_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_products_filters_by_category() -> None:
+    result = await search_products(_ctx(DataRecorder()), "nimbus", category="Tents")
+
+    assert [p.id for p in result.products] == ["TENT-UL-2P", "TENT-4S-2P"]
+    assert result.category_filter == "Tents"
+
+
+@pytest.mark.asyncio
+async def test_search_products_respects_max_results() -> None:
+    result = await search_products(_ctx(DataRecorder()), "nimbus", max_results=2)
+
+    assert len(result.products) == 2
+
+
+@pytest.mark.asyncio
+async def test_search_products_falls_back_to_sample_products() -> None:
+    result = await search_products(_ctx(DataRecorder()), "snowshoes", category="backpacks")
+
+    assert [p.id for p in result.products] == ["PACK-UL-45"]
+
+
+@pytest.mark.asyncio
+async def test_search_products_matches_substrings_across_words() -> None:
+    result = await search_products(_ctx(DataRecorder()), "ht 2-person", max_results=5)
+
+    assert [p.id for p in result.products] == ["TENT-UL-2P"]
+
+
+@pytest.mark.asyncio
+async def test_tool_payloads_match_response_dumps() -> None:
+    recorder = DataRecorder()
+    results = [
+        await search_products(_ctx(recorder), "tent"),
+        await lookup_order(_ctx(recorder), next(iter(ORDERS_DB))),
+        await get_policy(_ctx(recorder), "returns"),
+    ]
+
+    for event, result in zip(recorder.events, results, strict=True):
+        assert event["payload"] == result.model_dump(mode="json")
+
+
+@pytest.mark.parametrize("table", [PRODUCT_CATALOG, ORDERS_DB, POLICIES])
+def test_static_records_pass_validation(table: dict[str, Any]) -> None:
+    # Records are built with model_construct, so validate them here instead.
+    for record in table.values():
+        assert type(record).model_validate(record.model_dump()) == record
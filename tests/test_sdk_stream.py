@@ -2,7 +2,14 @@
 
 from __future__ import annotations
 
-from layercode_create_app.sdk.stream import StreamHelper
+import asyncio
+import json
+from typing import cast
+
+import pytest
+from pydantic import BaseModel
+
+from layercode_create_app.sdk.stream import StreamHelper, TtsBatcher, stream_response
 
 
 class Recorder:
@@ -35,3 +42,137 @@ def test_stream_helper_emits_expected_events() -> None:
     assert "response.data" in payloads[1]
     assert "response.end" in payloads[-1]
     assert controller.closed is True
+
+
+def test_tts_batcher_coalesces_until_sentence_boundary() -> None:
+    controller = Recorder()
+    helper = StreamHelper("turn123", UTF8Encoder(), controller)
+    batcher = TtsBatcher(helper)
+
+    for chunk in ("Hel", "lo", " there", ".", " How", " are", " you"):
+        batcher.push(chunk)
+    batcher.flush()
+
+    payloads = [event.decode("utf-8") for event in controller.events]
+    assert len(payloads) == 2
+    assert '"content":"Hello there."' in payloads[0]
+    assert '"content":" How are you"' in payloads[1]
+
+
+def test_tts_batcher_flushes_when_buffer_is_full() -> None:
+    controller = Recorder()
+    helper = StreamHelper("turn123", UTF8Encoder(), controller)
+    batcher = TtsBatcher(helper, max_chars=4)
+
+    batcher.push("ab")
+    assert controller.events == []
+    batcher.push("cd")
+    assert len(controller.events) == 1
+
+    batcher.flush()
+    assert len(controller.events) == 1
+
+
+def test_stream_helper_frames_are_valid_json() -> None:
+    controller = Recorder()
+    helper = StreamHelper("turn123", UTF8Encoder(), controller)
+
+    helper.data({"price": 3.5, "items": ["crème brûlée"], "nested": {"ok": True}})
+
+    frame = controller.events[0].decode("utf-8")
+    assert frame.startswith("data: ")
+    assert frame.endswith("\n\n")
+    assert json.loads(frame[len("data: ") :]) == {
+        "type": "response.data",
+        "turn_id": "turn123",
+        "content": {"price": 3.5, "items": ["crème brûlée"], "nested": {"ok": True}},
+    }
+
+
+def test_stream_helper_serializes_pydantic_models_in_data() -> None:
+    class Item(BaseModel):
+        name: str
+        price: float
+
+    controller = Recorder()
+    helper = StreamHelper("turn123", UTF8Encoder(), controller)
+
+    helper.data({"payload": Item(name="croissant", price=3.5)})
+
+    frame = controller.events[0].decode("utf-8")
+    content = json.loads(frame[len("data: ") :])["content"]
+    assert content == {"payload": {"name": "croissant", "price": 3.5}}
+
+
+def test_tts_batcher_ignores_empty_chunks() -> None:
+    controller = Recorder()
+    helper = StreamHelper("turn123", UTF8Encoder(), controller)
+    batcher = TtsBatcher(helper)
+
+    batcher.push("")
+    batcher.flush()
+    assert batcher.streamed is False
+    assert controller.events == []
+
+    batcher.push("Hi")
+    assert batcher.streamed is True
+
+
+def test_stream_helper_data_json_matches_data_frame() -> None:
+    content = {"tool": "lookup", "payload": {"name": "crème brûlée", "price": 3.5}}
+    controller = Recorder()
+    helper = StreamHelper('turn "1"', UTF8Encoder(), controller)
+
+    helper.data(content)
+    helper.data_json(json.dumps(content, separators=(",", ":"), ensure_ascii=False).encode())
+
+    assert controller.events[0] == controller.events[1]
+
+
+def test_stream_helper_tts_json_matches_tts_frame() -> None:
+    controller = Recorder()
+    helper = StreamHelper("turn123", UTF8Encoder(), controller)
+
+    helper.tts("Bonjour, ça va?")
+    helper.tts_json(json.dumps("Bonjour, ça va?", ensure_ascii=False).encode())
+
+    assert controller.events[0] == controller.events[1]
+
+
+@pytest.mark.asyncio
+async def test_stream_response_coalesces_frames_from_one_tick() -> None:
+    async def handler(stream: StreamHelper) -> None:
+        stream.tts("one")
+        stream.tts("two")
+        await asyncio.sleep(0)
+        stream.tts("three")
+
+    response = await stream_response({"turn_id": "t1"}, handler)
+    chunks = [chunk async for chunk in response.body_iterator]
+
+    frames = b"".join(cast(bytes, chunk) for chunk in chunks).decode().split("\n\n")[:-1]
+    assert [json.loads(frame[len("data: ") :]).get("content") for frame in frames] == [
+        "one",
+        "two",
+        "three",
+        None,
+    ]
+    assert len(chunks) < len(frames)
+
+
+@pytest.mark.asyncio
+async def test_tts_batcher_flushes_after_max_delay() -> None:
+    controller = Recorder()
+    helper = StreamHelper("turn123", UTF8Encoder(), controller)
+    batcher = TtsBatcher(helper, max_delay=0.01)
+
+    batcher.push("Hel")
+    batcher.push("lo")
+    assert controller.events == []
+
+    await asyncio.sleep(0.05)
+    assert len(controller.events) == 1
+    assert '"content":"Hello"' in controller.events[0].decode("utf-8")
+
+    batcher.flush()
+    assert len(controller.events) == 1
@@ -9,7 +9,8 @@ import time
 
 import pytest
 
-from layercode_create_app.sdk.auth import InvalidSignatureError, verify_signature
+from layercode_create_app.sdk import auth
+from layercode_create_app.sdk.auth import InvalidSignatureError, signing_key, verify_signature
 
 
 def _make_signature(payload: str, secret: str, timestamp: int) -> str:
@@ -45,3 +46,42 @@ def test_verify_signature_rejects_outdated_timestamp() -> None:
 
     with pytest.raises(InvalidSignatureError):
         verify_signature(body, signature, secret, tolerance_seconds=10)
+
+
+def test_verify_signature_accepts_bytes_payload_and_secret() -> None:
+    secret = "topsecret"
+    body = json.dumps({"hello": "wörld"}, ensure_ascii=False)
+    timestamp = int(time.time())
+    signature = _make_signature(body, secret, timestamp)
+
+    verify_signature(body.encode("utf-8"), signature, secret.encode("utf-8"))
+
+
+def test_verify_signature_rejects_non_hex_signature() -> None:
+    timestamp = int(time.time())
+
+    with pytest.raises(InvalidSignatureError, match="Malformed v1 signature"):
+        verify_signature("{}", f"t={timestamp},v1=not-hex", "topsecret")
+
+
+def test_verify_signature_reuses_signing_key() -> None:
+    secret = "topsecret"
+    key = signing_key(secret)
+    timestamp = int(time.time())
+
+    for body in ('{"a": 1}', '{"b": 2}'):
+        verify_signature(body, _make_signature(body, secret, timestamp), key)
+
+    with pytest.raises(InvalidSignatureError, match="Signature mismatch"):
+        verify_signature("{}", _make_signature("{}", "other", timestamp), key)
+
+
+def test_verify_signature_caches_raw_secret_key() -> None:
+    secret = "cached-secret"
+    timestamp = int(time.time())
+    before = auth._cached_signing_key.cache_info().hits
+
+    for body in ('{"a": 1}', '{"b": 2}'):
+        verify_signature(body, _make_signature(body, secret, timestamp), secret)
+
+    assert auth._cached_signing_key.cache_info().hits > before